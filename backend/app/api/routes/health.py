@@ -1,14 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from sqlalchemy import text
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
 from datetime import datetime, timezone
 import time
-import os
 
-from app.core.database import get_db
-from app.schemas.pipeline import HealthResponse
-from app.services.github_service import GitHubService
-from app.services.slack_service import SlackService
+from app.schemas.pipeline import HealthResponse, GitHubRateLimit
+from app.services.health_service import health_prober
 from app.core.config import settings
 
 router = APIRouter()
@@ -17,48 +13,34 @@ router = APIRouter()
 START_TIME = time.time()
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check(db: Session = Depends(get_db)):
-    """Health check endpoint"""
-    try:
-        # Check database connection
-        db.execute(text("SELECT 1"))
-        db_status = "healthy"
-    except Exception as e:
-        db_status = f"unhealthy: {str(e)}"
-    
-    # Check GitHub API connection
-    github_status = "not_configured"
-    if settings.GITHUB_TOKEN:
-        try:
-            github_service = GitHubService()
-            await github_service.test_connection()
-            github_status = "healthy"
-        except Exception as e:
-            github_status = f"unhealthy: {str(e)}"
-    
-    # Check Slack webhook connection
-    slack_status = "not_configured"
-    if settings.SLACK_WEBHOOK_URL:
-        try:
-            slack_service = SlackService()
-            await slack_service.test_connection()
-            slack_status = "healthy"
-        except Exception as e:
-            slack_status = f"unhealthy: {str(e)}"
-    
-    # Calculate uptime
-    uptime = time.time() - START_TIME
-    
+async def health_check():
+    """Health check endpoint, answered from the results of the background prober"""
+    rate_limit = health_prober.github_rate_limit
+
     return HealthResponse(
-        status="healthy" if db_status == "healthy" else "unhealthy",
+        status="healthy" if health_prober.database == "healthy" else "unhealthy",
         timestamp=datetime.now(timezone.utc),
         version=settings.APP_VERSION,
-        uptime=uptime,
-        database=db_status,
-        github=github_status,
-        slack=slack_status
+        uptime=time.time() - START_TIME,
+        database=health_prober.database,
+        github=health_prober.github,
+        slack=health_prober.slack,
+        github_rate_limit=GitHubRateLimit(**rate_limit) if rate_limit else None,
+        checked_at=health_prober.checked_at
     )
 
+@router.get("/health/live")
+async def liveness():
+    """Liveness: the process is up and serving requests"""
+    return {"status": "alive"}
+
+@router.get("/health/ready")
+async def readiness():
+    """Readiness: the last database probe succeeded"""
+    if not health_prober.ready:
+        return JSONResponse(status_code=503, content={"status": "not_ready", "database": health_prober.database})
+    return {"status": "ready"}
+
 @router.get("/ping")
 async def ping():
     """Simple ping endpoint"""
@@ -1,33 +1,85 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import Response
 from sqlalchemy.orm import Session
 from sqlalchemy import func, and_, desc, text
 from typing import Optional
-from datetime import datetime, timedelta
-import json
-from fastapi.encoders import jsonable_encoder
+from datetime import datetime, timedelta, timezone
+import orjson
 
-from app.core.database import get_db
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.database import get_db, get_read_db
 from app.models.pipeline import Pipeline, MetricsCache
 from app.schemas.pipeline import MetricsResponse, WorkflowMetrics
+from app.services.job_service import JobService
+from app.services.hot_window import hot_window
+from app.services.downsampling import lttb, min_max_envelope
 
 router = APIRouter()
 
+# Process-local copy of metrics_cache rows, already encoded as JSON bytes
+metrics_cache = TTLCache()
+
+def _summarize_pipelines(pipelines: list[Pipeline]) -> dict:
+    """Period totals, build-time stats and per-workflow counts computed from ORM rows"""
+    success_count = len([p for p in pipelines if p.status == "completed" and p.conclusion == "success"])
+    failure_count = len([p for p in pipelines if p.status == "completed" and p.conclusion == "failure"])
+
+    # Calculate build time statistics
+    completed_pipelines = [p for p in pipelines if p.status == "completed" and p.duration is not None]
+    build_times = [p.duration for p in completed_pipelines]
+
+    # Calculate workflow-specific metrics
+    workflow_data = {}
+    for pipeline in pipelines:
+        if pipeline.workflow_name not in workflow_data:
+            workflow_data[pipeline.workflow_name] = {
+                'executions': 0, 'success_count': 0, 'failure_count': 0, 'total_time': 0, 'completed_count': 0
+            }
+        workflow_data[pipeline.workflow_name]['executions'] += 1
+        if pipeline.status == "completed":
+            workflow_data[pipeline.workflow_name]['completed_count'] += 1
+            if pipeline.conclusion == "success":
+                workflow_data[pipeline.workflow_name]['success_count'] += 1
+            elif pipeline.conclusion == "failure":
+                workflow_data[pipeline.workflow_name]['failure_count'] += 1
+            if pipeline.duration:
+                workflow_data[pipeline.workflow_name]['total_time'] += pipeline.duration
+
+    return {
+        'total_executions': len(pipelines),
+        'success_count': success_count,
+        'failure_count': failure_count,
+        'average_build_time': sum(build_times) / len(build_times) if build_times else None,
+        'min_build_time': min(build_times) if build_times else None,
+        'max_build_time': max(build_times) if build_times else None,
+        'workflow_data': workflow_data,
+    }
+
 @router.get("/", response_model=MetricsResponse)
 async def get_metrics(
     period: str = Query("24h", description="Time period: 1h, 24h, 7d, 30d"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_db),
+    read_db: Session = Depends(get_read_db)
 ):
     """Get aggregated metrics for the dashboard"""
     try:
-        # Check cache first
+        # Check cache first; cached values are returned as-is without decoding
         cache_key = f"metrics_{period}"
+        cached_body = metrics_cache.get(cache_key)
+        if cached_body is not None:
+            return Response(content=cached_body, media_type="application/json")
+
         cached_metrics = db.query(MetricsCache).filter(
             MetricsCache.metric_key == cache_key,
             MetricsCache.expires_at > datetime.utcnow()
         ).first()
 
         if cached_metrics:
-            return json.loads(cached_metrics.metric_value)
+            cached_body = cached_metrics.metric_value.encode()
+            ttl = (cached_metrics.expires_at - datetime.now(timezone.utc)).total_seconds()
+            metrics_cache.set(cache_key, cached_body, min(ttl, settings.CACHE_TTL_SECONDS))
+            return Response(content=cached_body, media_type="application/json")
 
         # Calculate time range
         now = datetime.utcnow()
@@ -42,49 +94,31 @@ async def get_metrics(
         else:
             raise HTTPException(status_code=400, detail="Invalid period. Use: 1h, 24h, 7d, 30d")
 
-        # Get pipeline data for the period
-        pipelines = db.query(Pipeline).filter(
-            Pipeline.created_at >= start_time
-        ).all()
+        # Aggregate the period, from the in-memory hot window when it covers the range
+        if hot_window.covers(start_time):
+            summary = hot_window.summarize(start_time)
+        else:
+            summary = _summarize_pipelines(read_db.query(Pipeline).filter(
+                Pipeline.created_at >= start_time
+            ).all())
 
-        # Calculate metrics
-        total_executions = len(pipelines)
-        success_count = len([p for p in pipelines if p.status == "completed" and p.conclusion == "success"])
-        failure_count = len([p for p in pipelines if p.status == "completed" and p.conclusion == "failure"])
+        total_executions = summary['total_executions']
+        success_count = summary['success_count']
+        failure_count = summary['failure_count']
 
         # Calculate success rate
         completed_count = success_count + failure_count
         success_rate = (success_count / completed_count * 100) if completed_count > 0 else 0
 
-        # Calculate build time statistics
-        completed_pipelines = [p for p in pipelines if p.status == "completed" and p.duration is not None]
-        build_times = [p.duration for p in completed_pipelines]
-
-        avg_build_time = sum(build_times) / len(build_times) if build_times else None
-        min_build_time = min(build_times) if build_times else None
-        max_build_time = max(build_times) if build_times else None
+        avg_build_time = summary['average_build_time']
+        min_build_time = summary['min_build_time']
+        max_build_time = summary['max_build_time']
 
         # Get latest execution
-        latest_pipeline = db.query(Pipeline).order_by(desc(Pipeline.created_at)).first()
+        latest_pipeline = read_db.query(Pipeline).order_by(desc(Pipeline.created_at)).first()
 
-        # Calculate workflow-specific metrics
         workflow_metrics = []
-        workflow_data = {}
-
-        for pipeline in pipelines:
-            if pipeline.workflow_name not in workflow_data:
-                workflow_data[pipeline.workflow_name] = {
-                    'executions': 0, 'success_count': 0, 'failure_count': 0, 'total_time': 0, 'completed_count': 0
-                }
-            workflow_data[pipeline.workflow_name]['executions'] += 1
-            if pipeline.status == "completed":
-                workflow_data[pipeline.workflow_name]['completed_count'] += 1
-                if pipeline.conclusion == "success":
-                    workflow_data[pipeline.workflow_name]['success_count'] += 1
-                elif pipeline.conclusion == "failure":
-                    workflow_data[pipeline.workflow_name]['failure_count'] += 1
-                if pipeline.duration:
-                    workflow_data[pipeline.workflow_name]['total_time'] += pipeline.duration
+        workflow_data = summary['workflow_data']
 
         # Convert to WorkflowMetrics objects
         for workflow_name, data in workflow_data.items():
@@ -113,81 +147,131 @@ async def get_metrics(
             workflows=workflow_metrics
         )
 
-        # Cache the result, ensuring proper serialization
+        # Encode once; the same bytes are cached and served on later hits
+        body = orjson.dumps(response.model_dump())
+
         db.query(MetricsCache).filter(MetricsCache.metric_key == cache_key).delete()
         db.commit()
-        
+
         cache_entry = MetricsCache(
             metric_key=cache_key,
-            metric_value=json.dumps(jsonable_encoder(response)),
+            metric_value=body.decode(),
             period=period,
-            expires_at=datetime.utcnow() + timedelta(minutes=5)
+            expires_at=datetime.utcnow() + timedelta(seconds=settings.CACHE_TTL_SECONDS)
         )
         db.add(cache_entry)
         db.commit()
+        metrics_cache.set(cache_key, body, settings.CACHE_TTL_SECONDS)
 
-        return response
+        return Response(content=body, media_type="application/json")
     except HTTPException:
         raise
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail=f"Failed to calculate metrics: {str(e)}")
 
+def _bucketed_trend(db: Session, metric: str, start_time: datetime, interval_hours: int, buckets: int) -> list[float]:
+    """One value per interval bucket from a single GROUP BY over the whole range"""
+    bucket = func.floor(
+        (func.extract("epoch", Pipeline.created_at) - start_time.replace(tzinfo=timezone.utc).timestamp()) / (interval_hours * 3600)
+    ).label("bucket")
+    completed = Pipeline.status == "completed"
+    if metric == "success_rate":
+        value_columns = (
+            func.count(Pipeline.id).filter(completed).label("completed"),
+            func.count(Pipeline.id).filter(and_(completed, Pipeline.conclusion == "success")).label("success"),
+        )
+    elif metric == "build_time":
+        value_columns = (
+            func.avg(Pipeline.duration).filter(and_(completed, Pipeline.duration.isnot(None), Pipeline.duration != 0)).label("avg_duration"),
+        )
+    else:
+        value_columns = (
+            func.count(Pipeline.id).filter(and_(completed, Pipeline.conclusion == "failure")).label("failures"),
+        )
+
+    end_time = start_time + timedelta(hours=interval_hours * buckets)
+    rows = db.query(bucket, *value_columns).filter(
+        and_(Pipeline.created_at >= start_time, Pipeline.created_at < end_time)
+    ).group_by(bucket).all()
+
+    values = [0] * buckets
+    for row in rows:
+        index = int(row.bucket)
+        if not 0 <= index < buckets:
+            continue
+        if metric == "success_rate":
+            values[index] = (row.success / row.completed * 100) if row.completed else 0
+        elif metric == "build_time":
+            values[index] = float(row.avg_duration) if row.avg_duration is not None else 0
+        else:
+            values[index] = row.failures
+    return values
+
 @router.get("/trends")
 async def get_metrics_trends(
     metric: str = Query(..., description="Metric type: success_rate, build_time, failure_count"),
-    period: str = Query("24h", description="Time period: 24h, 7d, 30d"),
-    db: Session = Depends(get_db)
+    period: str = Query("24h", description="Time period: 24h, 7d, 30d, 90d"),
+    interval_hours: Optional[int] = Query(None, ge=1, le=24 * 30, description="Bucket size; defaults to the period's usual granularity"),
+    max_points: int = Query(settings.TRENDS_MAX_POINTS, ge=3, le=5000, description="Downsample to at most this many points"),
+    db: Session = Depends(get_read_db)
 ):
     """Get trend data for charts"""
     try:
+        if metric not in ("success_rate", "build_time", "failure_count"):
+            raise HTTPException(status_code=400, detail="Invalid metric.")
+
         now = datetime.utcnow()
         if period == "24h":
-            start_time, interval_hours = now - timedelta(days=1), 1
+            start_time, default_interval = now - timedelta(days=1), 1
         elif period == "7d":
-            start_time, interval_hours = now - timedelta(days=7), 6
+            start_time, default_interval = now - timedelta(days=7), 6
         elif period == "30d":
-            start_time, interval_hours = now - timedelta(days=30), 24
+            start_time, default_interval = now - timedelta(days=30), 24
+        elif period == "90d":
+            start_time, default_interval = now - timedelta(days=90), 24
         else:
-            raise HTTPException(status_code=400, detail="Invalid period. Use: 24h, 7d, 30d")
+            raise HTTPException(status_code=400, detail="Invalid period. Use: 24h, 7d, 30d, 90d")
+        interval_hours = interval_hours or default_interval
 
         intervals = []
         current_time = start_time
         while current_time <= now:
             intervals.append(current_time)
             current_time += timedelta(hours=interval_hours)
+        buckets = len(intervals) - 1
 
-        trend_data = []
-        for i in range(len(intervals) - 1):
-            interval_start, interval_end = intervals[i], intervals[i+1]
-            pipelines = db.query(Pipeline).filter(
-                and_(Pipeline.created_at >= interval_start, Pipeline.created_at < interval_end)
-            ).all()
-
-            value = 0
-            if metric == "success_rate":
-                completed = [p for p in pipelines if p.status == "completed"]
-                success_count = len([p for p in completed if p.conclusion == "success"])
-                value = (success_count / len(completed) * 100) if completed else 0
-            elif metric == "build_time":
-                completed = [p for p in pipelines if p.status == "completed" and p.duration]
-                value = sum(p.duration for p in completed) / len(completed) if completed else 0
-            elif metric == "failure_count":
-                value = len([p for p in pipelines if p.status == "completed" and p.conclusion == "failure"])
-            else:
-                raise HTTPException(status_code=400, detail="Invalid metric.")
-
-            trend_data.append({
-                "timestamp": interval_start.isoformat(),
-                "value": round(value, 2)
-            })
+        if hot_window.covers(start_time):
+            values = hot_window.trend(metric, start_time, interval_hours, buckets)
+        else:
+            values = _bucketed_trend(db, metric, start_time, interval_hours, buckets)
+
+        # Bound the payload for long ranges: LTTB keeps the shape of rates and durations,
+        # the min/max envelope keeps failure spikes visible
+        points = list(enumerate(values))
+        downsampled = len(points) > max_points
+        if downsampled:
+            points = min_max_envelope(points, max_points) if metric == "failure_count" else lttb(points, max_points)
+
+        trend_data = [
+            {"timestamp": intervals[i].isoformat(), "value": round(value, 2)}
+            for i, value in points
+        ]
 
-        return {"metric": metric, "period": period, "data": trend_data}
+        return {
+            "metric": metric,
+            "period": period,
+            "interval_hours": interval_hours,
+            "downsampled": downsampled,
+            "data": trend_data
+        }
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to calculate trends: {str(e)}")
 
 @router.get("/workflows")
-async def get_workflow_metrics(db: Session = Depends(get_db)):
+async def get_workflow_metrics(db: Session = Depends(get_read_db)):
     """Get metrics grouped by workflow"""
     try:
         workflows = db.query(
@@ -213,3 +297,28 @@ async def get_workflow_metrics(db: Session = Depends(get_db)):
         return {"workflows": workflow_metrics}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch workflow metrics: {str(e)}")
+
+@router.get("/steps")
+async def get_step_metrics(
+    period: str = Query("7d", description="Time period: 24h, 7d, 30d"),
+    workflow: Optional[str] = Query(None),
+    db: Session = Depends(get_read_db)
+):
+    """Per-step duration aggregates from the job timings cached so far"""
+    try:
+        now = datetime.utcnow()
+        if period == "24h":
+            start_time = now - timedelta(days=1)
+        elif period == "7d":
+            start_time = now - timedelta(days=7)
+        elif period == "30d":
+            start_time = now - timedelta(days=30)
+        else:
+            raise HTTPException(status_code=400, detail="Invalid period. Use: 24h, 7d, 30d")
+
+        steps = JobService().step_rollup(db, start_time, workflow)
+        return {"period": period, "workflow": workflow, "steps": steps}
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch step metrics: {str(e)}")
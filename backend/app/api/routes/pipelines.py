@@ -1,17 +1,47 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, ORJSONResponse, StreamingResponse
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import desc
+from sqlalchemy import Float, cast, desc, func, select, tuple_
 from typing import Optional
-from datetime import datetime, timezone
+from datetime import datetime
 
-from app.core.database import get_db
-from app.models.pipeline import Pipeline, Alert
-from app.schemas.pipeline import Pipeline as PipelineSchema, PipelineList, SyncResponse
-from app.services.github_service import GitHubService
-from app.services.slack_service import SlackService
+from app.core.database import get_db, get_read_db, read_session_factory
+from app.models.pipeline import Pipeline
+from app.schemas.pipeline import Pipeline as PipelineSchema, PipelineDetail, PipelineJob as PipelineJobSchema, PipelineList, SyncResponse, SyncJob as SyncJobSchema
+from app.services.export_service import ExportService, EXPORT_MEDIA_TYPES
+from app.services.job_service import JobService
+from app.services.hot_window import hot_window
+from app.services.sync_coordinator import sync_coordinator
 
 router = APIRouter()
 
+# Fields returned by list responses by default, in the order of the Pipeline schema
+PIPELINE_FIELDS = tuple(PipelineSchema.model_fields)
+
+# Named field profiles accepted by ?fields=; "compact" is what the dashboard table needs
+# and is covered by idx_pipelines_created_at_compact for index-only scans
+FIELD_PROFILES = {
+    "compact": ("id", "workflow_name", "status", "conclusion", "created_at", "duration"),
+}
+
+
+def resolve_fields(fields: Optional[str]) -> tuple[str, ...]:
+    """Turn a fields= value (profile name or comma-separated list) into schema field names"""
+    if not fields:
+        return PIPELINE_FIELDS
+    if fields in FIELD_PROFILES:
+        return FIELD_PROFILES[fields]
+    requested = tuple(dict.fromkeys(f.strip() for f in fields.split(",") if f.strip()))
+    unknown = [f for f in requested if f not in PIPELINE_FIELDS]
+    if unknown or not requested:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields: {', '.join(unknown) or fields}. Use a profile ({', '.join(FIELD_PROFILES)}) or any of: {', '.join(PIPELINE_FIELDS)}"
+        )
+    return requested
+
 
 @router.get("/", response_model=PipelineList)
 async def get_pipelines(
@@ -19,8 +49,10 @@ async def get_pipelines(
     limit: int = Query(50, ge=1, le=100),
     status: Optional[str] = Query(None),
     workflow: Optional[str] = Query(None),
-    db: Session = Depends(get_db)
+    fields: Optional[str] = Query(None, description="Comma-separated field names or a profile: compact"),
+    db: Session = Depends(get_read_db)
 ):
+    selected_fields = resolve_fields(fields)
     try:
         query = db.query(Pipeline)
         if status:
@@ -30,16 +62,19 @@ async def get_pipelines(
 
         total = query.count()
         offset = (page - 1) * limit
-        pipelines = query.order_by(desc(Pipeline.created_at)).offset(offset).limit(limit).all()
+        columns = [getattr(Pipeline, field) for field in selected_fields]
+        rows = query.with_entities(*columns).order_by(desc(Pipeline.created_at)).offset(offset).limit(limit).all()
         pages = (total + limit - 1) // limit
 
-        return PipelineList(pipelines=pipelines, total=total, page=page, limit=limit, pages=pages)
+        # Encode row tuples directly instead of validating each row into a schema
+        pipelines = [dict(zip(selected_fields, row)) for row in rows]
+        return ORJSONResponse({"pipelines": pipelines, "total": total, "page": page, "limit": limit, "pages": pages})
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to fetch pipelines: {str(e)}")
 
 
 @router.get("/latest", response_model=PipelineSchema)
-async def get_latest_pipeline(db: Session = Depends(get_db)):
+async def get_latest_pipeline(db: Session = Depends(get_read_db)):
     try:
         pipeline = db.query(Pipeline).order_by(desc(Pipeline.created_at)).first()
         if not pipeline:
@@ -51,88 +86,250 @@ async def get_latest_pipeline(db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail=f"Failed to fetch latest pipeline: {str(e)}")
 
 
-@router.get("/{pipeline_id}", response_model=PipelineSchema)
-async def get_pipeline(pipeline_id: int, db: Session = Depends(get_db)):
+@router.get("/export")
+async def export_pipelines(
+    format: str = Query("ndjson", description="Export format: ndjson, csv, parquet"),
+    start: Optional[datetime] = Query(None, description="Only runs created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only runs created before this time"),
+    status: Optional[str] = Query(None),
+    conclusion: Optional[str] = Query(None),
+    workflow: Optional[str] = Query(None),
+    branch: Optional[str] = Query(None),
+    actor: Optional[str] = Query(None),
+    fields: Optional[str] = Query(None, description="Comma-separated field names or a profile: compact"),
+):
+    """Stream pipeline history in created_at order for offline analysis"""
+    if format not in EXPORT_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Invalid format. Use: {', '.join(EXPORT_MEDIA_TYPES)}")
+    selected_fields = resolve_fields(fields)
+    columns = [getattr(Pipeline, field) for field in selected_fields]
+
+    statement = select(*columns)
+    if start:
+        statement = statement.where(Pipeline.created_at >= start)
+    if end:
+        statement = statement.where(Pipeline.created_at < end)
+    if status:
+        statement = statement.where(Pipeline.status == status)
+    if conclusion:
+        statement = statement.where(Pipeline.conclusion == conclusion)
+    if workflow:
+        statement = statement.where(Pipeline.workflow_name == workflow)
+    if branch:
+        statement = statement.where(Pipeline.branch == branch)
+    if actor:
+        statement = statement.where(Pipeline.actor == actor)
+    statement = statement.order_by(Pipeline.created_at, Pipeline.id)
+
+    exporter = ExportService(session_factory=await run_in_threadpool(read_session_factory))
+
+    async def body():
+        # A client disconnect cancels this generator; abort the running query with it
+        try:
+            async for chunk in iterate_in_threadpool(exporter.stream(statement, selected_fields, columns, format)):
+                if chunk:
+                    yield chunk
+        finally:
+            exporter.cancel()
+
+    filename = f"pipelines.{format}"
+    return StreamingResponse(
+        body(),
+        media_type=EXPORT_MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
+
+
+@router.get("/changes")
+async def get_pipeline_changes(
+    since: Optional[str] = Query(None, description="Token from a previous response; omit to start from the beginning"),
+    limit: int = Query(500, ge=1, le=5000),
+    fields: Optional[str] = Query(None, description="Comma-separated field names or a profile: compact"),
+    db: Session = Depends(get_read_db)
+):
+    """Rows inserted or updated after `since`, in change order, with the token for the next pull"""
     try:
-        pipeline = db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
-        if not pipeline:
-            raise HTTPException(status_code=404, detail="Pipeline not found")
-        return pipeline
-    except HTTPException:
-        raise
+        since_seq = int(since) if since else 0
+        if since_seq < 0:
+            raise ValueError
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid since token")
+    selected_fields = resolve_fields(fields)
+    try:
+        columns = [getattr(Pipeline, field) for field in selected_fields]
+        rows = db.query(Pipeline.change_seq, *columns).filter(
+            Pipeline.change_seq > since_seq
+        ).order_by(Pipeline.change_seq).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        next_seq = rows[-1][0] if rows else since_seq
+        changes = [dict(zip(selected_fields, row[1:])) for row in rows]
+        return ORJSONResponse({"changes": changes, "next_token": str(next_seq), "has_more": has_more})
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Failed to fetch pipeline: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Failed to fetch pipeline changes: {str(e)}")
+
+
+def parse_search_cursor(cursor: Optional[str]) -> Optional[tuple[float, int]]:
+    """A search cursor is the score and id of the last row returned, as "score:id" """
+    if not cursor:
+        return None
+    try:
+        score, pipeline_id = cursor.rsplit(":", 1)
+        return float(score), int(pipeline_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+@router.get("/search")
+async def search_pipelines(
+    q: Optional[str] = Query(None, description="Full-text query over commit messages (web search syntax)"),
+    branch: Optional[str] = Query(None, description="Fuzzy match on branch name"),
+    actor: Optional[str] = Query(None, description="Fuzzy match on actor"),
+    start: Optional[datetime] = Query(None, description="Only runs created at or after this time"),
+    end: Optional[datetime] = Query(None, description="Only runs created before this time"),
+    status: Optional[str] = Query(None),
+    conclusion: Optional[str] = Query(None),
+    workflow: Optional[str] = Query(None),
+    cursor: Optional[str] = Query(None, description="next_cursor from a previous response"),
+    limit: int = Query(50, ge=1, le=100),
+    fields: Optional[str] = Query(None, description="Comma-separated field names or a profile: compact"),
+    db: Session = Depends(get_read_db)
+):
+    """Runs matching the text and fuzzy terms, best match first"""
+    if not (q or branch or actor):
+        raise HTTPException(status_code=400, detail="Provide at least one of q, branch or actor")
+    after = parse_search_cursor(cursor)
+    selected_fields = resolve_fields(fields)
+    try:
+        # Each term filters through its GIN index and contributes to the score
+        conditions = []
+        scores = []
+        if q:
+            tsquery = func.websearch_to_tsquery("english", q)
+            conditions.append(Pipeline.commit_message_tsv.op("@@")(tsquery))
+            scores.append(func.ts_rank_cd(Pipeline.commit_message_tsv, tsquery))
+        for column, term in ((Pipeline.branch, branch), (Pipeline.actor, actor)):
+            if term:
+                conditions.append(column.op("%>")(term))
+                scores.append(func.word_similarity(term, column))
+        score = cast(sum(scores[1:], scores[0]), Float)
 
+        if start:
+            conditions.append(Pipeline.created_at >= start)
+        if end:
+            conditions.append(Pipeline.created_at < end)
+        if status:
+            conditions.append(Pipeline.status == status)
+        if conclusion:
+            conditions.append(Pipeline.conclusion == conclusion)
+        if workflow:
+            conditions.append(Pipeline.workflow_name == workflow)
+        if after:
+            conditions.append(tuple_(score, Pipeline.id) < tuple_(*after))
 
-@router.post("/sync", response_model=SyncResponse)
-async def sync_pipelines(db: Session = Depends(get_db)):
+        columns = [getattr(Pipeline, field) for field in selected_fields]
+        rows = db.query(score.label("score"), Pipeline.id, *columns).filter(
+            *conditions
+        ).order_by(desc("score"), desc(Pipeline.id)).limit(limit + 1).all()
+
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+        results = [{**dict(zip(selected_fields, row[2:])), "score": row[0]} for row in rows]
+        next_cursor = f"{rows[-1][0]!r}:{rows[-1][1]}" if has_more else None
+        return ORJSONResponse({"results": results, "next_cursor": next_cursor, "has_more": has_more})
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to search pipelines: {str(e)}")
+
+
+@router.post("/sync", response_model=SyncResponse, responses={202: {"model": SyncJobSchema}})
+async def sync_pipelines(
+    wait: bool = Query(True, description="Wait for the sync to finish; with false, return the job right away"),
+    db: Session = Depends(get_db)
+):
     """
     Fetch GitHub Actions pipelines, update DB, and send Slack notifications once per pipeline.
+    Joins the sync already in progress, if any, rather than starting another one.
     """
     try:
-        github_service = GitHubService()
-        slack_service = SlackService()
+        job = sync_coordinator.trigger("manual")
+        if not wait:
+            return JSONResponse(status_code=202, content=jsonable_encoder(SyncJobSchema.model_validate(job)))
 
-        new_pipelines = await github_service.sync_workflow_runs(db)
+        await sync_coordinator.wait(job)
+        if job.status == "failed":
+            raise HTTPException(status_code=500, detail=f"Failed to sync pipelines: {job.error}")
         total_executions = db.query(Pipeline).count()
 
-        for pipeline in new_pipelines:
-            try:
-                if pipeline.status == "completed":
-                    # Check if this pipeline has already been notified
-                    existing_alert = db.query(Alert).filter(
-                        Alert.pipeline_id == pipeline.id
-                    ).first()
-                    if existing_alert:
-                        continue  # Skip already notified pipelines
-
-                    if pipeline.conclusion == "failure":
-                        sent = await slack_service.send_pipeline_failure_alert(pipeline)
-                        alert_status = "sent" if sent else "failed"
-                        a = Alert(
-                            pipeline_id=pipeline.id,
-                            alert_type="pipeline_failure",
-                            message=f"Slack notification {alert_status}",
-                            status=alert_status
-                        )
-                        db.add(a)
-                        try:
-                            db.commit()
-                        except Exception:
-                            db.rollback()
-
-                    elif pipeline.conclusion == "success":
-                        sent = await slack_service.send_pipeline_success_notification(pipeline)
-                        a = Alert(
-                            pipeline_id=pipeline.id,
-                            alert_type="pipeline_success",
-                            message=f"Slack notification {'sent' if sent else 'failed'}",
-                            status="sent" if sent else "failed"
-                        )
-                        db.add(a)
-                        try:
-                            db.commit()
-                        except Exception:
-                            db.rollback()
-
-            except Exception as e:
-                print(f"[WARN] Slack notification failed for pipeline {pipeline.id}: {str(e)}")
-
         return SyncResponse(
             success=True,
-            message=f"Successfully synced {len(new_pipelines)} pipeline executions",
-            new_executions=len(new_pipelines),
+            message=f"Successfully synced {job.new_executions} pipeline executions",
+            new_executions=job.new_executions,
             total_executions=total_executions,
-            sync_time=datetime.now(timezone.utc)
+            sync_time=job.finished_at,
+            job_id=job.id
         )
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to sync pipelines: {str(e)}")
 
 
+@router.get("/sync/{job_id}", response_model=SyncJobSchema)
+async def get_sync_job(job_id: str):
+    job = sync_coordinator.get_job(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Sync job not found")
+    return job
+
+
+@router.get("/{pipeline_id}", response_model=PipelineDetail)
+async def get_pipeline(pipeline_id: int, db: Session = Depends(get_db)):
+    try:
+        pipeline = db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+        if not pipeline:
+            raise HTTPException(status_code=404, detail="Pipeline not found")
+        jobs = await JobService().get_jobs(pipeline, db)
+        detail = PipelineDetail.model_validate(pipeline)
+        detail.jobs = [PipelineJobSchema.model_validate(job) for job in jobs]
+        return detail
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch pipeline: {str(e)}")
+
+
+@router.get("/{pipeline_id}/jobs", response_model=list[PipelineJobSchema])
+async def get_pipeline_jobs(pipeline_id: int, db: Session = Depends(get_db)):
+    """Job and step timings for a run, loaded from GitHub on first view"""
+    try:
+        pipeline = db.query(Pipeline).filter(Pipeline.id == pipeline_id).first()
+        if not pipeline:
+            raise HTTPException(status_code=404, detail="Pipeline not found")
+        return await JobService().get_jobs(pipeline, db)
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to fetch pipeline jobs: {str(e)}")
+
+
 @router.get("/stats/summary")
-async def get_pipeline_stats(db: Session = Depends(get_db)):
+async def get_pipeline_stats(db: Session = Depends(get_read_db)):
     try:
+        if hot_window.covers(None):
+            stats = hot_window.stats()
+            completed_count = stats["success_count"] + stats["failure_count"]
+            success_rate = (stats["success_count"] / completed_count * 100) if completed_count else 0
+            return {
+                "total_pipelines": stats["total"],
+                "success_count": stats["success_count"],
+                "failure_count": stats["failure_count"],
+                "running_count": stats["running_count"],
+                "success_rate": round(success_rate, 2),
+                "average_build_time": round(stats["average_build_time"], 2)
+            }
+
         total = db.query(Pipeline).count()
         success_count = db.query(Pipeline).filter(Pipeline.status == "completed", Pipeline.conclusion == "success").count()
         failure_count = db.query(Pipeline).filter(Pipeline.status == "completed", Pipeline.conclusion == "failure").count()
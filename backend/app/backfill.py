@@ -0,0 +1,45 @@
+"""
+Backfill GitHub Actions run history into the database.
+
+Usage:
+    python -m app.backfill --since 2023-01-01 [--until 2024-01-01] [--concurrency 4] [--range-days 7]
+
+Runs as its own process next to the API, so the regular background sync keeps going.
+The last BACKFILL_LIVE_HORIZON_DAYS are left to that sync, so it still sees recently
+finished runs as new and sends their notifications.
+Re-running with the same arguments skips ranges that were already loaded.
+"""
+import argparse
+import asyncio
+from datetime import date, datetime, time, timedelta, timezone
+
+from app.core.config import settings
+from app.core.database import engine, Base, create_extensions
+from app.services.backfill_service import BackfillService
+
+
+def _day_start(value: str) -> datetime:
+    return datetime.combine(date.fromisoformat(value), time.min, tzinfo=timezone.utc)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Backfill GitHub Actions run history")
+    parser.add_argument("--since", required=True, type=_day_start, help="First day to import (YYYY-MM-DD)")
+    parser.add_argument("--until", type=_day_start, default=None, help="Day to stop before (YYYY-MM-DD), at most the live sync horizon")
+    parser.add_argument("--concurrency", type=int, default=settings.BACKFILL_CONCURRENCY, help="Ranges fetched at once")
+    parser.add_argument("--range-days", type=int, default=settings.BACKFILL_RANGE_DAYS, help="Days per checkpointed range")
+    args = parser.parse_args()
+
+    horizon = _day_start((date.today() - timedelta(days=settings.BACKFILL_LIVE_HORIZON_DAYS)).isoformat())
+    if args.until and args.until > horizon:
+        print(f"[Backfill] --until is inside the live sync window, stopping at {horizon.date()} instead.")
+    until = min(args.until or horizon, horizon)
+
+    create_extensions()
+    Base.metadata.create_all(bind=engine)
+    service = BackfillService(concurrency=args.concurrency, range_days=args.range_days)
+    asyncio.run(service.run(args.since, until))
+
+
+if __name__ == "__main__":
+    main()
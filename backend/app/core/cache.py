@@ -0,0 +1,28 @@
+import time
+from typing import Optional
+
+
+class TTLCache:
+    """Small in-process cache holding pre-encoded values until they expire"""
+
+    def __init__(self):
+        self._entries: dict[str, tuple[float, bytes]] = {}
+
+    def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            self._entries.pop(key, None)
+            return None
+        return value
+
+    def set(self, key: str, value: bytes, ttl_seconds: float):
+        self._entries[key] = (time.monotonic() + ttl_seconds, value)
+
+    def delete(self, key: str):
+        self._entries.pop(key, None)
+
+    def clear(self):
+        self._entries.clear()
@@ -14,6 +14,15 @@ class Settings(BaseSettings):
     POSTGRES_PASSWORD: str = "secure_password"
     POSTGRES_HOST: str = "db"
     POSTGRES_PORT: int = 5432
+
+    # Read replica settings; read-only routes use the replica when POSTGRES_REPLICA_HOST is set
+    POSTGRES_REPLICA_HOST: Optional[str] = None
+    POSTGRES_REPLICA_PORT: int = 5432
+    REPLICA_POOL_SIZE: int = 5
+    REPLICA_MAX_OVERFLOW: int = 10
+    REPLICA_MAX_LAG_SECONDS: float = 5.0  # fall back to the primary beyond this lag
+    REPLICA_CHECK_INTERVAL_SECONDS: float = 1.0  # how long a replica lag reading is trusted
+    REPLICA_CONNECT_TIMEOUT_SECONDS: int = 2  # an unreachable replica fails fast and reads go to the primary
     
     # GitHub settings
     GITHUB_TOKEN: Optional[str] = None
@@ -26,18 +35,56 @@ class Settings(BaseSettings):
     # API settings
     API_V1_STR: str = "/api"
     BACKEND_CORS_ORIGINS: list = ["http://localhost:3000", "http://frontend:3000"]
+    GZIP_MINIMUM_SIZE: int = 1024  # responses larger than this are gzip-compressed
     
     # Sync settings
-    SYNC_INTERVAL_SECONDS: int = 300  # 5 minutes
+    SYNC_INTERVAL_SECONDS: int = 300  # first idle interval; grows while nothing changes
+    SYNC_ACTIVE_INTERVAL_SECONDS: int = 15  # interval while runs are queued or in progress
+    SYNC_MAX_INTERVAL_SECONDS: int = 900  # idle back-off ceiling
+    SYNC_BACKOFF_FACTOR: float = 2.0
+    SYNC_REFRESH_CONCURRENCY: int = 8  # in-flight runs re-fetched at once
+    SYNC_IN_FLIGHT_MAX_AGE_HOURS: int = 24  # older unfinished runs are only polled on the slow cadence below
+    SYNC_OLD_IN_FLIGHT_INTERVAL_SECONDS: int = 3600  # how often runs past that age are re-checked
+    SYNC_IN_FLIGHT_LIST_THRESHOLD: int = 5  # above this many in-flight runs, use status-filtered run lists
+    SYNC_MANUAL_MIN_INTERVAL_SECONDS: int = 30  # manual triggers within this window of the last sync get that sync back
     MAX_SYNC_RETRIES: int = 3
+
+    # Job timing settings
+    JOBS_REFRESH_SECONDS: int = 60  # how long jobs of an unfinished run are served from cache
+    JOBS_PREFETCH_CONCURRENCY: int = 4  # failed runs whose jobs are prefetched at once
+
+    # Backfill settings
+    BACKFILL_CONCURRENCY: int = 4  # date ranges fetched from GitHub at once
+    BACKFILL_RANGE_DAYS: int = 7  # size of each checkpointed date range
+    BACKFILL_LIVE_HORIZON_DAYS: int = 1  # the most recent days are left to the regular sync
     
+    # Health probe settings
+    HEALTH_PROBE_INTERVAL_SECONDS: int = 30  # how often DB, GitHub and Slack are re-checked
+
     # Cache settings
     CACHE_TTL_SECONDS: int = 300  # 5 minutes
+
+    # Analytics settings
+    ANALYTICS_HOT_WINDOW_ENABLED: bool = False  # answer recent-range aggregations from memory (needs numpy)
+    ANALYTICS_HOT_WINDOW_DAYS: int = 7
+
+    # Default point budget for /api/metrics/trends before downsampling kicks in
+    TRENDS_MAX_POINTS: int = 300
+
+    # Export settings
+    EXPORT_CHUNK_SIZE: int = 5000  # rows fetched from the server-side cursor per chunk
     
     @property
     def DATABASE_URL(self) -> str:
         """Generate database URL from components"""
         return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_HOST}:{self.POSTGRES_PORT}/{self.POSTGRES_DB}"
+
+    @property
+    def REPLICA_DATABASE_URL(self) -> Optional[str]:
+        """Generate read replica URL from components, if a replica is configured"""
+        if not self.POSTGRES_REPLICA_HOST:
+            return None
+        return f"postgresql://{self.POSTGRES_USER}:{self.POSTGRES_PASSWORD}@{self.POSTGRES_REPLICA_HOST}:{self.POSTGRES_REPLICA_PORT}/{self.POSTGRES_DB}"
     
     class Config:
         env_file = ".env"
@@ -1,4 +1,9 @@
-from sqlalchemy import create_engine
+import threading
+import time
+from typing import Optional
+
+from sqlalchemy import Engine, create_engine, text
+from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from app.core.config import settings
@@ -16,9 +21,156 @@ engine = create_engine(
 # Create session factory
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Optional read replica with its own pool, used only by read-only routes
+replica_engine = create_engine(
+    settings.REPLICA_DATABASE_URL,
+    pool_pre_ping=True,
+    pool_size=settings.REPLICA_POOL_SIZE,
+    max_overflow=settings.REPLICA_MAX_OVERFLOW,
+    pool_recycle=3600,
+    connect_args={"connect_timeout": settings.REPLICA_CONNECT_TIMEOUT_SECONDS},
+    echo=settings.DEBUG
+) if settings.REPLICA_DATABASE_URL else None
+
+ReplicaSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=replica_engine) if replica_engine else None
+
+class ReplicaRouter:
+    """
+    Decides whether a read can go to the replica. Writers call record_write() after
+    committing; until the replica has replayed past that WAL position reads go to the
+    primary, so results of a sync are visible immediately. Reads also fall back to the
+    primary while the replica is unreachable or lags more than REPLICA_MAX_LAG_SECONDS.
+    """
+
+    def __init__(self, primary: Engine, replica: Optional[Engine]):
+        self.primary = primary
+        self.replica = replica
+        self.last_write_lsn = 0
+        self.replayed_lsn = 0
+        self.lag_seconds: Optional[float] = None
+        self.checked_at = 0.0
+        self._refresh_lock = threading.Lock()
+
+    def record_write(self):
+        if self.replica is None:
+            return
+        try:
+            with self.primary.connect() as connection:
+                lsn = connection.execute(text("SELECT pg_current_wal_lsn() - '0/0'::pg_lsn")).scalar()
+            self.last_write_lsn = max(self.last_write_lsn, int(lsn))
+        except Exception as e:
+            print(f"[WARN] Failed to read primary WAL position: {e}")
+
+    def _refresh(self):
+        try:
+            with self.replica.connect() as connection:
+                row = connection.execute(text("""
+                    SELECT
+                        pg_last_wal_replay_lsn() - '0/0'::pg_lsn AS replayed_lsn,
+                        CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                             ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp())
+                        END AS lag_seconds
+                """)).one()
+            self.replayed_lsn = int(row.replayed_lsn) if row.replayed_lsn is not None else 0
+            self.lag_seconds = float(row.lag_seconds) if row.lag_seconds is not None else None
+        except Exception as e:
+            self.mark_unavailable(e)
+            return
+        self.checked_at = time.monotonic()
+
+    def mark_unavailable(self, error: Exception):
+        """Send reads to the primary until the next lag check finds the replica again"""
+        print(f"[WARN] Read replica unavailable, using primary: {error}")
+        self.lag_seconds = None
+        self.checked_at = time.monotonic()
+
+    def use_replica(self) -> bool:
+        if self.replica is None:
+            return False
+        stale = time.monotonic() - self.checked_at > settings.REPLICA_CHECK_INTERVAL_SECONDS
+        behind_write = self.replayed_lsn < self.last_write_lsn
+        if (stale or behind_write) and self._refresh_lock.acquire(blocking=False):
+            try:
+                self._refresh()
+            finally:
+                self._refresh_lock.release()
+        return (
+            self.lag_seconds is not None
+            and self.lag_seconds <= settings.REPLICA_MAX_LAG_SECONDS
+            and self.replayed_lsn >= self.last_write_lsn
+        )
+
+replica_router = ReplicaRouter(engine, replica_engine)
+
+def read_session_factory() -> sessionmaker:
+    """Session factory for read-only work: the replica when it is usable, else the primary"""
+    if replica_router.use_replica():
+        try:
+            # Checks out (and pre-pings) a replica connection, so a dead replica fails here
+            # within the connect timeout rather than in the middle of a request
+            with replica_engine.connect():
+                return ReplicaSessionLocal
+        except OperationalError as e:
+            replica_router.mark_unavailable(e)
+    return SessionLocal
+
 # Create base class for models
 Base = declarative_base()
 
+# Extensions the models depend on; created before create_all
+EXTENSIONS = ["pg_trgm"]
+
+def create_extensions():
+    with engine.begin() as connection:
+        for extension in EXTENSIONS:
+            connection.execute(text(f"CREATE EXTENSION IF NOT EXISTS {extension}"))
+
+# Idempotent DDL for objects that create_all cannot add to an existing database
+SCHEMA_UPGRADES = [
+    # Lets the compact pipeline list be served by an index-only scan
+    """
+    CREATE INDEX IF NOT EXISTS idx_pipelines_created_at_compact ON pipelines(created_at DESC)
+    INCLUDE (id, workflow_name, status, conclusion, duration)
+    """,
+    # Job fetch markers moved to pipeline_job_fetches, which does not fire the change trigger
+    "ALTER TABLE pipelines DROP COLUMN IF EXISTS jobs_fetched_at",
+    # Monotonic change sequence behind /api/pipelines/changes. Writers take a transaction-level
+    # advisory lock first, so sequence order matches commit order and no change can be skipped.
+    "CREATE SEQUENCE IF NOT EXISTS pipelines_change_seq",
+    "ALTER TABLE pipelines ADD COLUMN IF NOT EXISTS change_seq BIGINT",
+    "CREATE INDEX IF NOT EXISTS idx_pipelines_change_seq ON pipelines(change_seq)",
+    """
+    CREATE OR REPLACE FUNCTION pipelines_bump_change_seq() RETURNS trigger AS $$
+    BEGIN
+        PERFORM pg_advisory_xact_lock(7202902);
+        NEW.change_seq := nextval('pipelines_change_seq');
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    """
+    CREATE OR REPLACE TRIGGER pipelines_change_seq_trigger
+    BEFORE INSERT OR UPDATE ON pipelines
+    FOR EACH ROW EXECUTE FUNCTION pipelines_bump_change_seq()
+    """,
+    # Rows written before the trigger existed; the no-op update lets the trigger number them
+    "UPDATE pipelines SET change_seq = NULL WHERE change_seq IS NULL",
+    # Full-text and fuzzy search behind /api/pipelines/search
+    """
+    ALTER TABLE pipelines ADD COLUMN IF NOT EXISTS commit_message_tsv tsvector
+    GENERATED ALWAYS AS (to_tsvector('english', coalesce(commit_message, ''))) STORED
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_pipelines_commit_message_tsv ON pipelines USING gin (commit_message_tsv)",
+    "CREATE INDEX IF NOT EXISTS idx_pipelines_branch_trgm ON pipelines USING gin (branch gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS idx_pipelines_actor_trgm ON pipelines USING gin (actor gin_trgm_ops)",
+]
+
+def apply_schema_upgrades():
+    """Bring an existing database up to the current schema"""
+    with engine.begin() as connection:
+        for statement in SCHEMA_UPGRADES:
+            connection.execute(text(statement))
+
 def get_db():
     """Dependency to get database session"""
     db = SessionLocal()
@@ -26,3 +178,11 @@ def get_db():
         yield db
     finally:
         db.close()
+
+def get_read_db():
+    """Dependency to get a session for read-only routes, routed to the replica when possible"""
+    db = read_session_factory()()
+    try:
+        yield db
+    finally:
+        db.close()
@@ -6,9 +6,11 @@ import asyncio
 
 from app.api.routes import pipelines, metrics, health
 from app.core.config import settings
-from app.core.database import engine, Base, SessionLocal
-from app.services.github_service import GitHubService
-from app.services.slack_service import SlackService
+from app.core.middleware import SelectiveGZipMiddleware
+from app.core.database import engine, Base, SessionLocal, create_extensions, apply_schema_upgrades
+from app.services.sync_coordinator import sync_coordinator
+from app.services.hot_window import hot_window
+from app.services.health_service import health_prober
 
 app = FastAPI(
     title="CI/CD Pipeline Health Dashboard",
@@ -24,41 +26,36 @@ app.add_middleware(
     allow_methods=["*"],
     allow_headers=["*"],
 )
+app.add_middleware(SelectiveGZipMiddleware, minimum_size=settings.GZIP_MINIMUM_SIZE)
 
 app.include_router(health.router, prefix="/api", tags=["health"])
 app.include_router(pipelines.router, prefix="/api/pipelines", tags=["pipelines"])
 app.include_router(metrics.router, prefix="/api/metrics", tags=["metrics"])
 
 async def background_sync_task():
-    """Periodically syncs GitHub data and triggers notifications."""
+    """Syncs GitHub data on an adaptive schedule and triggers notifications."""
     await asyncio.sleep(10) # Initial delay to allow DB to be fully ready
+    scheduler = sync_coordinator.scheduler
     while True:
         print(f"--- Running background sync: {datetime.utcnow().isoformat()} ---")
-        db = SessionLocal()
-        try:
-            github_service = GitHubService()
-            slack_service = SlackService()
-            
-            synced_pipelines = await github_service.sync_workflow_runs(db)
+        # Joins a manual sync if one is already running
+        job = await sync_coordinator.wait(sync_coordinator.trigger("background"))
+        if job.status == "failed":
+            print(f"ERROR in background task: {job.error}")
 
-            if synced_pipelines:
-                print(f"Sync complete. Found {len(synced_pipelines)} new/updated runs. Checking for notifications.")
-                await slack_service.send_notifications_for_completed_runs(synced_pipelines, db)
-            else:
-                print("Sync complete. No new updates found.")
-        except Exception as e:
-            print(f"ERROR in background task: {e}")
-            db.rollback()
-        finally:
-            db.close()
-        
-        await asyncio.sleep(settings.SYNC_INTERVAL_SECONDS)
+        interval = scheduler.next_interval(changed=bool(job.new_executions), in_flight=job.in_flight)
+        print(f"Next sync in {interval:.0f}s ({'runs in flight' if job.in_flight else 'idle'}).")
+        await asyncio.sleep(interval)
 
 @app.on_event("startup")
 async def on_startup():
+    create_extensions()
     Base.metadata.create_all(bind=engine)
+    apply_schema_upgrades()
+    await asyncio.to_thread(hot_window.load, SessionLocal)
     asyncio.create_task(background_sync_task())
-    print("🚀 Application startup complete. Background sync task scheduled.")
+    asyncio.create_task(health_prober.run())
+    print("🚀 Application startup complete. Background sync and health probe tasks scheduled.")
 
 @app.get("/")
 async def root():
@@ -1,4 +1,6 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, BigInteger, Index
+from sqlalchemy import Column, Integer, String, DateTime, Text, Boolean, BigInteger, Index, UniqueConstraint, FetchedValue, Computed, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.orm import deferred
 from sqlalchemy.sql import func
 from app.core.database import Base
 from datetime import datetime
@@ -22,10 +24,46 @@ class Pipeline(Base):
     actor = Column(String(255), nullable=True)
     html_url = Column(Text, nullable=True)
     logs_url = Column(Text, nullable=True)
+    # Set by the pipelines_change_seq_trigger on every insert and update
+    change_seq = Column(BigInteger, nullable=True, server_default=FetchedValue(), server_onupdate=FetchedValue())
+    # Full-text search document for /api/pipelines/search; deferred so regular loads skip it
+    commit_message_tsv = deferred(Column(
+        TSVECTOR,
+        Computed("to_tsvector('english', coalesce(commit_message, ''))", persisted=True)
+    ))
 
     def __repr__(self):
         return f"<Pipeline(id={self.id}, workflow_name='{self.workflow_name}', status='{self.status}')>"
 
+class PipelineJob(Base):
+    __tablename__ = "pipeline_jobs"
+
+    id = Column(BigInteger, primary_key=True, index=True)
+    pipeline_id = Column(BigInteger, ForeignKey("pipelines.id"), nullable=False, index=True)
+    github_job_id = Column(BigInteger, unique=True, nullable=False)
+    name = Column(String(255), nullable=False)
+    status = Column(String(50), nullable=False)
+    conclusion = Column(String(50), nullable=True)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+    duration = Column(Integer, nullable=True)
+    steps = Column(JSONB, nullable=False, default=list)  # [{number, name, status, conclusion, duration}]
+    fetched_at = Column(DateTime(timezone=True), nullable=False, default=func.now())
+
+    def __repr__(self):
+        return f"<PipelineJob(id={self.id}, pipeline_id={self.pipeline_id}, name='{self.name}')>"
+
+class PipelineJobFetch(Base):
+    __tablename__ = "pipeline_job_fetches"
+
+    # When a run's jobs were last loaded from GitHub, even if it had none. Kept apart
+    # from pipelines so writing it does not fire the change_seq trigger.
+    pipeline_id = Column(BigInteger, ForeignKey("pipelines.id"), primary_key=True)
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+
+    def __repr__(self):
+        return f"<PipelineJobFetch(pipeline_id={self.pipeline_id}, fetched_at={self.fetched_at})>"
+
 class Workflow(Base):
     __tablename__ = "workflows"
 
@@ -65,10 +103,35 @@ class MetricsCache(Base):
     def __repr__(self):
         return f"<MetricsCache(id={self.id}, key='{self.metric_key}', period='{self.period}')>"
 
+class BackfillCheckpoint(Base):
+    __tablename__ = "backfill_checkpoints"
+    __table_args__ = (UniqueConstraint("repository", "range_start", "range_end", name="uq_backfill_checkpoints_range"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    repository = Column(String(255), nullable=False)
+    range_start = Column(DateTime(timezone=True), nullable=False)
+    range_end = Column(DateTime(timezone=True), nullable=False)
+    runs_loaded = Column(Integer, nullable=False, default=0)
+    completed_at = Column(DateTime(timezone=True), default=func.now())
+
+    def __repr__(self):
+        return f"<BackfillCheckpoint(repository='{self.repository}', range_start={self.range_start}, range_end={self.range_end})>"
+
 # Create indexes for better performance
 Index('idx_pipelines_status', Pipeline.status)
 Index('idx_pipelines_created_at', Pipeline.created_at)
 Index('idx_pipelines_workflow', Pipeline.workflow_name)
+# Covers the "compact" list projection so it can be served by an index-only scan
+Index(
+    'idx_pipelines_created_at_compact',
+    Pipeline.created_at.desc(),
+    postgresql_include=['id', 'workflow_name', 'status', 'conclusion', 'duration'],
+)
+Index('idx_pipelines_change_seq', Pipeline.change_seq)
+# Search indexes; the trigram ones need the pg_trgm extension (see create_extensions)
+Index('idx_pipelines_commit_message_tsv', Pipeline.commit_message_tsv, postgresql_using='gin')
+Index('idx_pipelines_branch_trgm', Pipeline.branch, postgresql_using='gin', postgresql_ops={'branch': 'gin_trgm_ops'})
+Index('idx_pipelines_actor_trgm', Pipeline.actor, postgresql_using='gin', postgresql_ops={'actor': 'gin_trgm_ops'})
 Index('idx_alerts_pipeline_id', Alert.pipeline_id)
 Index('idx_alerts_sent_at', Alert.sent_at)
 Index('idx_metrics_cache_expires', MetricsCache.expires_at)
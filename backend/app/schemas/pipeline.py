@@ -33,6 +33,29 @@ class Pipeline(PipelineBase):
     class Config:
         from_attributes = True
 
+class JobStep(BaseModel):
+    number: Optional[int] = Field(None, description="Step position within the job")
+    name: Optional[str] = Field(None, description="Step name")
+    status: Optional[str] = Field(None, description="Current status of the step")
+    conclusion: Optional[str] = Field(None, description="Conclusion of the step")
+    duration: Optional[int] = Field(None, description="Duration in seconds")
+
+class PipelineJob(BaseModel):
+    github_job_id: int = Field(..., description="GitHub Actions job ID")
+    name: str = Field(..., description="Job name")
+    status: str = Field(..., description="Current status of the job")
+    conclusion: Optional[str] = Field(None, description="Conclusion of the job")
+    started_at: Optional[datetime] = Field(None, description="Job start time")
+    completed_at: Optional[datetime] = Field(None, description="Job completion time")
+    duration: Optional[int] = Field(None, description="Duration in seconds")
+    steps: List[JobStep] = Field(default_factory=list, description="Steps of the job")
+
+    class Config:
+        from_attributes = True
+
+class PipelineDetail(Pipeline):
+    jobs: List[PipelineJob] = Field(default_factory=list, description="Jobs of the run with step timings")
+
 class PipelineList(BaseModel):
     pipelines: List[Pipeline] = Field(..., description="List of pipelines")
     total: int = Field(..., description="Total number of pipelines")
@@ -75,6 +98,24 @@ class SyncResponse(BaseModel):
     new_executions: int = Field(..., description="Number of new executions synced")
     total_executions: int = Field(..., description="Total number of executions")
     sync_time: datetime = Field(..., description="Sync operation timestamp")
+    job_id: Optional[str] = Field(None, description="Sync job this request joined")
+
+class SyncJob(BaseModel):
+    id: str = Field(..., description="Sync job ID")
+    source: str = Field(..., description="What started the sync: manual or background")
+    status: str = Field(..., description="running, completed or failed")
+    started_at: datetime = Field(..., description="When the sync started")
+    finished_at: Optional[datetime] = Field(None, description="When the sync finished")
+    new_executions: Optional[int] = Field(None, description="Number of new or updated executions")
+    error: Optional[str] = Field(None, description="Failure reason")
+
+    class Config:
+        from_attributes = True
+
+class GitHubRateLimit(BaseModel):
+    limit: int = Field(..., description="Requests allowed per window")
+    remaining: int = Field(..., description="Requests left in the current window")
+    reset: datetime = Field(..., description="When the current window resets")
 
 class HealthResponse(BaseModel):
     status: str = Field(..., description="Health status")
@@ -84,4 +125,6 @@ class HealthResponse(BaseModel):
     database: str = Field(..., description="Database connection status")
     github: str = Field(..., description="GitHub API connection status")
     slack: str = Field(..., description="Slack webhook connection status")
+    github_rate_limit: Optional[GitHubRateLimit] = Field(None, description="GitHub API rate-limit budget")
+    checked_at: Optional[datetime] = Field(None, description="When the dependencies were last probed")
 
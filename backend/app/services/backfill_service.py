@@ -0,0 +1,193 @@
+import asyncio
+import csv
+import io
+from datetime import datetime, timedelta
+from typing import Optional
+
+from sqlalchemy import Engine, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import sessionmaker
+
+from app.core.config import settings
+from app.core.database import SessionLocal, engine
+from app.models.pipeline import BackfillCheckpoint
+from app.services.github_service import GitHubService
+
+# Columns written through the staging table, in COPY order
+STAGING_COLUMNS = (
+    "github_run_id", "workflow_name", "status", "conclusion", "created_at", "updated_at",
+    "started_at", "completed_at", "duration", "branch", "commit_sha", "commit_message",
+    "actor", "html_url", "logs_url",
+)
+
+# Key for the PostgreSQL advisory lock that keeps backfills from running twice
+BACKFILL_LOCK_ID = 7202901
+
+# GitHub stops paginating a filtered run list after this many results
+GITHUB_MAX_RESULTS = 1000
+MIN_SPLIT = timedelta(hours=1)
+
+_column_list = ", ".join(STAGING_COLUMNS)
+
+CREATE_STAGING_SQL = f"""
+CREATE TEMP TABLE pipelines_staging ON COMMIT DROP AS
+SELECT {_column_list} FROM pipelines WITH NO DATA
+"""
+
+COPY_STAGING_SQL = f"COPY pipelines_staging ({_column_list}) FROM STDIN WITH (FORMAT csv)"
+
+# Runs the regular sync already finished are left alone; anything else takes the staged values
+MERGE_STAGING_SQL = f"""
+INSERT INTO pipelines ({_column_list})
+SELECT DISTINCT ON (github_run_id) {_column_list}
+FROM pipelines_staging
+ORDER BY github_run_id, updated_at DESC
+ON CONFLICT (github_run_id) DO UPDATE SET
+    {", ".join(f"{c} = EXCLUDED.{c}" for c in STAGING_COLUMNS if c != "github_run_id")}
+WHERE pipelines.status <> 'completed'
+"""
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def _github_range(start: datetime, end: datetime) -> str:
+    """GitHub's created filter is inclusive on both ends; ranges here are [start, end)"""
+    last = end - timedelta(seconds=1)
+    return f"{start.strftime('%Y-%m-%dT%H:%M:%SZ')}..{last.strftime('%Y-%m-%dT%H:%M:%SZ')}"
+
+
+class BackfillService:
+    """
+    Imports historical workflow runs by splitting history into created-date ranges,
+    fetching several ranges concurrently and bulk-loading each one through COPY.
+    Each loaded range is checkpointed in the same transaction, so an interrupted
+    backfill picks up where it stopped when re-run with the same arguments.
+    """
+
+    def __init__(
+        self,
+        github_service: Optional[GitHubService] = None,
+        session_factory: sessionmaker = SessionLocal,
+        lock_engine: Engine = engine,
+        concurrency: int = settings.BACKFILL_CONCURRENCY,
+        range_days: int = settings.BACKFILL_RANGE_DAYS,
+    ):
+        self.github_service = github_service or GitHubService()
+        self.session_factory = session_factory
+        self.lock_engine = lock_engine
+        self.range_size = timedelta(days=range_days)
+        self.repository = f"{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}"
+        self._slots = asyncio.Semaphore(concurrency)
+
+    def plan_ranges(self, since: datetime, until: datetime) -> list[tuple[datetime, datetime]]:
+        ranges = []
+        start = since
+        while start < until:
+            end = min(start + self.range_size, until)
+            ranges.append((start, end))
+            start = end
+        return ranges
+
+    def completed_ranges(self) -> set[tuple[datetime, datetime]]:
+        db = self.session_factory()
+        try:
+            rows = db.query(BackfillCheckpoint.range_start, BackfillCheckpoint.range_end).filter(
+                BackfillCheckpoint.repository == self.repository
+            ).all()
+            return {(row.range_start, row.range_end) for row in rows}
+        finally:
+            db.close()
+
+    async def fetch_range(self, start: datetime, end: datetime) -> list[dict]:
+        """Fetch every run created in [start, end), halving the range when GitHub would truncate it"""
+        created = _github_range(start, end)
+        first_page = await self.github_service.get_workflow_runs(page=1, created=created)
+        if first_page.get("total_count", 0) > GITHUB_MAX_RESULTS:
+            if end - start <= MIN_SPLIT:
+                # GitHub would truncate this range; fail it so it is not checkpointed as complete
+                raise Exception(f"{first_page['total_count']} runs created in {created}, more than GitHub returns for one range")
+            middle = start + (end - start) / 2
+            return await self.fetch_range(start, middle) + await self.fetch_range(middle, end)
+
+        runs = list(first_page.get("workflow_runs", []))
+        page_runs = runs
+        page = 1
+        while len(page_runs) == 100:
+            page += 1
+            page_runs = (await self.github_service.get_workflow_runs(page=page, created=created)).get("workflow_runs", [])
+            runs.extend(page_runs)
+        return runs
+
+    def _staging_row(self, run: dict) -> tuple:
+        row = self.github_service.parse_workflow_run(run).model_dump()
+        # Keep GitHub's own timestamps so imported history lands on the right dates
+        row["created_at"] = _parse_timestamp(run.get("created_at"))
+        row["updated_at"] = _parse_timestamp(run.get("updated_at"))
+        return tuple(row[column] for column in STAGING_COLUMNS)
+
+    def load_range(self, start: datetime, end: datetime, runs: list[dict]) -> int:
+        """COPY runs into a staging table, merge them into pipelines and checkpoint the range"""
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(self._staging_row(run) for run in runs)
+        buffer.seek(0)
+
+        db = self.session_factory()
+        try:
+            cursor = db.connection().connection.cursor()
+            cursor.execute(CREATE_STAGING_SQL)
+            cursor.copy_expert(COPY_STAGING_SQL, buffer)
+            cursor.execute(MERGE_STAGING_SQL)
+            db.execute(pg_insert(BackfillCheckpoint).values(
+                repository=self.repository,
+                range_start=start,
+                range_end=end,
+                runs_loaded=len(runs),
+            ).on_conflict_do_nothing())
+            db.commit()
+            return len(runs)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def backfill_range(self, start: datetime, end: datetime) -> int:
+        async with self._slots:
+            runs = await self.fetch_range(start, end)
+            loaded = await asyncio.to_thread(self.load_range, start, end, runs)
+            print(f"[Backfill] {start.date()}..{end.date()}: loaded {loaded} runs")
+            return loaded
+
+    async def run(self, since: datetime, until: datetime) -> int:
+        """Backfill [since, until); returns the number of runs loaded by this invocation"""
+        # Session-level lock on an autocommit connection, so no transaction stays open meanwhile
+        lock_connection = self.lock_engine.connect().execution_options(isolation_level="AUTOCOMMIT")
+        locked = False
+        try:
+            locked = lock_connection.execute(text("SELECT pg_try_advisory_lock(:key)"), {"key": BACKFILL_LOCK_ID}).scalar()
+            if not locked:
+                print("[Backfill] Another backfill is already running, exiting.")
+                return 0
+
+            done = self.completed_ranges()
+            pending = [r for r in self.plan_ranges(since, until) if r not in done]
+            print(f"[Backfill] {self.repository}: {len(pending)} ranges to load, {len(done)} already checkpointed")
+
+            results = await asyncio.gather(*(self.backfill_range(start, end) for start, end in pending), return_exceptions=True)
+
+            loaded = 0
+            failed = 0
+            for (start, end), result in zip(pending, results):
+                if isinstance(result, Exception):
+                    failed += 1
+                    print(f"[ERROR] Backfill of {start.date()}..{end.date()} failed: {result}")
+                else:
+                    loaded += result
+            print(f"[Backfill] Done. Loaded {loaded} runs; {failed} ranges failed and will be retried on the next run.")
+            return loaded
+        finally:
+            if locked:
+                lock_connection.execute(text("SELECT pg_advisory_unlock(:key)"), {"key": BACKFILL_LOCK_ID})
+            lock_connection.close()
@@ -0,0 +1,62 @@
+from typing import Sequence
+
+
+def lttb(points: Sequence[tuple[float, float]], threshold: int) -> list[tuple[float, float]]:
+    """
+    Largest-Triangle-Three-Buckets: keep `threshold` points that preserve the visual
+    shape of the series. The first and last points are always kept; from every bucket
+    in between, the point forming the largest triangle with the previously kept point
+    and the average of the next bucket wins.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+
+    sampled = [points[0]]
+    bucket_size = (n - 2) / (threshold - 2)
+    previous = 0
+    for i in range(threshold - 2):
+        start = int(i * bucket_size) + 1
+        end = int((i + 1) * bucket_size) + 1
+
+        next_start = end
+        next_end = min(int((i + 2) * bucket_size) + 1, n)
+        next_bucket = points[next_start:next_end]
+        avg_x = sum(p[0] for p in next_bucket) / len(next_bucket)
+        avg_y = sum(p[1] for p in next_bucket) / len(next_bucket)
+
+        ax, ay = points[previous]
+        best_area = -1.0
+        best = start
+        for j in range(start, end):
+            bx, by = points[j]
+            area = abs((ax - avg_x) * (by - ay) - (ax - bx) * (avg_y - ay))
+            if area > best_area:
+                best_area = area
+                best = j
+        sampled.append(points[best])
+        previous = best
+
+    sampled.append(points[-1])
+    return sampled
+
+
+def min_max_envelope(points: Sequence[tuple[float, float]], threshold: int) -> list[tuple[float, float]]:
+    """
+    Keep the minimum and maximum point of each of threshold/2 buckets, in time order,
+    so isolated spikes (e.g. a burst of failures) survive downsampling.
+    """
+    n = len(points)
+    if threshold >= n or threshold < 2:
+        return list(points)
+
+    buckets = threshold // 2
+    bucket_size = n / buckets
+    sampled = []
+    for i in range(buckets):
+        bucket = range(int(i * bucket_size), int((i + 1) * bucket_size))
+        low = min(bucket, key=lambda j: points[j][1])
+        high = max(bucket, key=lambda j: points[j][1])
+        for j in sorted({low, high}):
+            sampled.append(points[j])
+    return sampled
@@ -0,0 +1,170 @@
+import csv
+import io
+import threading
+from typing import Iterator, Sequence
+
+import orjson
+from sqlalchemy import BigInteger, DateTime, Integer, Select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+
+class _NdjsonEncoder:
+    def __init__(self, fields: Sequence[str], columns: Sequence):
+        self.fields = fields
+
+    def header(self) -> bytes:
+        return b""
+
+    def encode(self, rows) -> bytes:
+        fields = self.fields
+        return b"".join(orjson.dumps(dict(zip(fields, row))) + b"\n" for row in rows)
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _CsvEncoder:
+    def __init__(self, fields: Sequence[str], columns: Sequence):
+        self.fields = fields
+        self.buffer = io.StringIO()
+        self.writer = csv.writer(self.buffer)
+
+    def _drain(self) -> bytes:
+        data = self.buffer.getvalue().encode()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+        return data
+
+    def header(self) -> bytes:
+        self.writer.writerow(self.fields)
+        return self._drain()
+
+    def encode(self, rows) -> bytes:
+        self.writer.writerows(rows)
+        return self._drain()
+
+    def finish(self) -> bytes:
+        return b""
+
+
+class _ChunkSink:
+    """Write-only file object that hands written bytes back to the caller chunk by chunk"""
+
+    def __init__(self):
+        self.chunks: list[bytes] = []
+        self.position = 0
+        self.closed = False
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self.chunks.append(data)
+        self.position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self.position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b"".join(self.chunks)
+        self.chunks.clear()
+        return data
+
+
+class _ParquetEncoder:
+    """Writes one parquet row group per fetched chunk"""
+
+    def __init__(self, fields: Sequence[str], columns: Sequence):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.pa = pa
+        self.fields = fields
+        self.schema = pa.schema([(field, self._arrow_type(column)) for field, column in zip(fields, columns)])
+        self.sink = _ChunkSink()
+        self.writer = pq.ParquetWriter(self.sink, self.schema)
+
+    def _arrow_type(self, column):
+        pa = self.pa
+        column_type = column.type
+        if isinstance(column_type, (BigInteger, Integer)):
+            return pa.int64()
+        if isinstance(column_type, DateTime):
+            return pa.timestamp("us", tz="UTC") if column_type.timezone else pa.timestamp("us")
+        return pa.string()
+
+    def header(self) -> bytes:
+        return self.sink.drain()
+
+    def encode(self, rows) -> bytes:
+        arrays = [self.pa.array(values, type=field.type) for values, field in zip(zip(*rows), self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+        return self.sink.drain()
+
+    def finish(self) -> bytes:
+        self.writer.close()
+        return self.sink.drain()
+
+
+ENCODERS = {
+    "ndjson": _NdjsonEncoder,
+    "csv": _CsvEncoder,
+    "parquet": _ParquetEncoder,
+}
+
+
+class ExportService:
+    """
+    Streams the result of a column select through a server-side cursor, encoding one
+    chunk at a time so memory stays bounded regardless of the number of rows.
+    """
+
+    def __init__(self, session_factory: sessionmaker = SessionLocal, chunk_size: int = settings.EXPORT_CHUNK_SIZE):
+        self.session_factory = session_factory
+        self.chunk_size = chunk_size
+        self._cancelled = threading.Event()
+        self._dbapi_connection = None
+
+    def cancel(self):
+        """Stop the export and abort the query currently running on the server"""
+        self._cancelled.set()
+        connection = self._dbapi_connection
+        if connection is not None and hasattr(connection, "cancel"):
+            try:
+                connection.cancel()
+            except Exception as e:
+                print(f"[WARN] Failed to cancel export query: {e}")
+
+    def stream(self, statement: Select, fields: Sequence[str], columns: Sequence, fmt: str) -> Iterator[bytes]:
+        encoder = ENCODERS[fmt](fields, columns)
+        db: Session = self.session_factory()
+        try:
+            result = db.execute(statement.execution_options(yield_per=self.chunk_size))
+            self._dbapi_connection = db.connection().connection.dbapi_connection
+            yield encoder.header()
+            for rows in result.partitions():
+                if self._cancelled.is_set():
+                    return
+                yield encoder.encode(rows)
+            yield encoder.finish()
+        except Exception:
+            if self._cancelled.is_set():
+                return
+            raise
+        finally:
+            self._dbapi_connection = None
+            db.close()
@@ -1,12 +1,24 @@
 import httpx
 import asyncio
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.models.pipeline import Pipeline
 from app.schemas.pipeline import PipelineCreate
 
+# Run statuses that can still change on GitHub's side
+IN_FLIGHT_STATUSES = ("queued", "in_progress", "waiting", "requested", "pending")
+
+
+def in_flight_conditions() -> tuple:
+    """Filter for unfinished runs young enough to be polled every round"""
+    cutoff = datetime.now(timezone.utc) - timedelta(hours=settings.SYNC_IN_FLIGHT_MAX_AGE_HOURS)
+    return Pipeline.status.in_(IN_FLIGHT_STATUSES), Pipeline.created_at >= cutoff
+
+
 class GitHubService:
     def __init__(self):
         self.base_url = "https://api.github.com"
@@ -15,17 +27,71 @@ class GitHubService:
             "Accept": "application/vnd.github.v3+json",
             "User-Agent": "CI-CD-Dashboard/1.0"
         }
+        # github_run_ids seen by the last sync_workflow_runs call
+        self.seen_run_ids: set[int] = set()
+        # Whether the last sync_workflow_runs call paged to its end without an error
+        self.last_sync_complete = False
 
-    async def get_workflow_runs(self, page: int = 1, per_page: int = 100) -> dict:
+    async def get_rate_limit(self) -> dict:
+        """Core REST rate-limit budget; this call does not count against the limit"""
+        async with httpx.AsyncClient() as client:
+            resp = await client.get(f"{self.base_url}/rate_limit", headers=self.headers, timeout=10.0)
+            resp.raise_for_status()
+            return resp.json()["resources"]["core"]
+
+    async def get_workflow_runs(self, page: int = 1, per_page: int = 100, created: Optional[str] = None,
+                                status: Optional[str] = None) -> dict:
+        """List workflow runs; `created` uses GitHub's range syntax, e.g. 2024-01-01..2024-01-07"""
         if not all([settings.GITHUB_OWNER, settings.GITHUB_REPO]):
             raise Exception("GitHub configuration incomplete")
         url = f"{self.base_url}/repos/{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}/actions/runs"
         params = {"page": page, "per_page": per_page}
+        if created:
+            params["created"] = created
+        if status:
+            params["status"] = status
         async with httpx.AsyncClient() as client:
             resp = await client.get(url, headers=self.headers, params=params, timeout=30.0)
             resp.raise_for_status()
             return resp.json()
 
+    async def get_run_jobs(self, run_id: int) -> list[dict]:
+        """Fetch every job (with its steps) of the latest attempt of a workflow run"""
+        if not all([settings.GITHUB_OWNER, settings.GITHUB_REPO]):
+            raise Exception("GitHub configuration incomplete")
+        url = f"{self.base_url}/repos/{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}/actions/runs/{run_id}/jobs"
+        jobs = []
+        page = 1
+        async with httpx.AsyncClient() as client:
+            while True:
+                resp = await client.get(url, headers=self.headers, params={"page": page, "per_page": 100}, timeout=30.0)
+                resp.raise_for_status()
+                page_jobs = resp.json().get("jobs", [])
+                jobs.extend(page_jobs)
+                if len(page_jobs) < 100:
+                    return jobs
+                page += 1
+
+    async def get_runs_with_status(self, status: str) -> list[dict]:
+        """Every run currently in `status`, paging through the filtered run list"""
+        runs = []
+        page = 1
+        while True:
+            page_runs = (await self.get_workflow_runs(page=page, status=status)).get("workflow_runs", [])
+            runs.extend(page_runs)
+            if len(page_runs) < 100:
+                return runs
+            page += 1
+
+    async def get_workflow_run(self, run_id: int) -> dict:
+        if not all([settings.GITHUB_OWNER, settings.GITHUB_REPO]):
+            raise Exception("GitHub configuration incomplete")
+        url = f"{self.base_url}/repos/{settings.GITHUB_OWNER}/{settings.GITHUB_REPO}/actions/runs/{run_id}"
+        async with httpx.AsyncClient() as client:
+            resp = await client.get(url, headers=self.headers, timeout=30.0)
+            resp.raise_for_status()
+            return resp.json()
+
     def parse_workflow_run(self, run_data: dict) -> PipelineCreate:
         started_at = datetime.fromisoformat(run_data["run_started_at"].replace("Z", "+00:00")) if run_data.get("run_started_at") else None
         completed_at = datetime.fromisoformat(run_data["updated_at"].replace("Z", "+00:00")) if run_data["status"] == "completed" else None
@@ -47,37 +113,59 @@ class GitHubService:
             logs_url=run_data["logs_url"]
         )
 
-    async def sync_workflow_runs(self, db: Session) -> list[Pipeline]:
+    def upsert_run(self, db: Session, run: dict) -> Optional[Pipeline]:
+        """Insert or update one run; returns the pipeline if it is new or its status changed"""
+        pipeline_data = self.parse_workflow_run(run)
+        existing = db.query(Pipeline).filter(Pipeline.github_run_id == pipeline_data.github_run_id).first()
+        if existing is None:
+            # ON CONFLICT so a run inserted meanwhile (e.g. by a backfill) does not abort the page
+            inserted_id = db.execute(
+                pg_insert(Pipeline).values(**pipeline_data.model_dump())
+                .on_conflict_do_nothing(index_elements=[Pipeline.github_run_id])
+                .returning(Pipeline.id)
+            ).scalar()
+            if inserted_id is not None:
+                # Loaded here so the ID is available for the alert table foreign key
+                return db.get(Pipeline, inserted_id)
+            existing = db.query(Pipeline).filter(Pipeline.github_run_id == pipeline_data.github_run_id).first()
+        if existing.status != pipeline_data.status or existing.conclusion != pipeline_data.conclusion:
+            for key, value in pipeline_data.model_dump(exclude_unset=True).items():
+                setattr(existing, key, value)
+            return existing
+        return None
+
+    async def sync_workflow_runs(self, db: Session, full: bool = True) -> list[Pipeline]:
+        """
+        Page through workflow runs, newest first. With full=False paging stops at the
+        first page that brings nothing new; unfinished older runs are kept current by
+        refresh_in_flight_runs instead. Sets last_sync_complete when no page failed.
+        """
         synced_pipelines: list[Pipeline] = []
+        self.seen_run_ids = set()
+        self.last_sync_complete = False
         page = 1
         while True:
             try:
                 runs_data = await self.get_workflow_runs(page=page)
                 runs = runs_data.get("workflow_runs", [])
                 if not runs:
+                    self.last_sync_complete = True
                     break
-                
+
+                page_changes = 0
                 for run in runs:
+                    self.seen_run_ids.add(run.get("id"))
                     try:
-                        pipeline_data = self.parse_workflow_run(run)
-                        existing = db.query(Pipeline).filter(Pipeline.github_run_id == pipeline_data.github_run_id).first()
-                        if existing:
-                            if existing.status != pipeline_data.status or existing.conclusion != pipeline_data.conclusion:
-                                for key, value in pipeline_data.model_dump(exclude_unset=True).items():
-                                    setattr(existing, key, value)
-                                synced_pipelines.append(existing)
-                        else:
-                            new_pipeline = Pipeline(**pipeline_data.model_dump())
-                            db.add(new_pipeline)
-                            # We must flush to get the ID for the alert table foreign key
-                            db.flush()
-                            db.refresh(new_pipeline)
-                            synced_pipelines.append(new_pipeline)
+                        pipeline = self.upsert_run(db, run)
+                        if pipeline is not None:
+                            synced_pipelines.append(pipeline)
+                            page_changes += 1
                     except Exception as e:
                         print(f"[WARN] Failed to parse or add run {run.get('id')}: {e}")
 
                 db.commit()
-                if len(runs) < 100:
+                if len(runs) < 100 or (not full and page_changes == 0):
+                    self.last_sync_complete = True
                     break
                 page += 1
             except Exception as e:
@@ -85,3 +173,70 @@ class GitHubService:
                 db.rollback()
                 break # Stop sync on page failure
         return synced_pipelines
+
+    async def refresh_in_flight_runs(self, db: Session, skip_run_ids: set[int] = frozenset(),
+                                     include_old: bool = False) -> list[Pipeline]:
+        """
+        Bring the runs stored as queued/in progress up to date. A handful are re-fetched
+        with one GET /runs/{id} each; above SYNC_IN_FLIGHT_LIST_THRESHOLD the run list is
+        read once per unfinished status instead, and only runs missing from those lists
+        (finished or gone) are fetched one by one. Runs older than
+        SYNC_IN_FLIGHT_MAX_AGE_HOURS are included only when include_old is set.
+        """
+        conditions = (Pipeline.status.in_(IN_FLIGHT_STATUSES),) if include_old else in_flight_conditions()
+        in_flight = db.query(Pipeline.github_run_id, Pipeline.status).filter(*conditions).all()
+        tracked = {row.github_run_id: row.status for row in in_flight if row.github_run_id not in skip_run_ids}
+        if not tracked:
+            return []
+
+        listed: list[dict] = []
+        if len(tracked) > settings.SYNC_IN_FLIGHT_LIST_THRESHOLD:
+            try:
+                for status in sorted(set(tracked.values()) | {"queued", "in_progress"}):
+                    listed.extend(await self.get_runs_with_status(status))
+            except Exception as e:
+                print(f"[WARN] Failed to list in-flight runs, retrying next round: {e}")
+                return []
+        listed_ids = {run["id"] for run in listed}
+        run_ids = [run_id for run_id in tracked if run_id not in listed_ids]
+
+        slots = asyncio.Semaphore(settings.SYNC_REFRESH_CONCURRENCY)
+        gone_run_ids: list[int] = []
+
+        async def fetch(run_id: int):
+            async with slots:
+                try:
+                    return await self.get_workflow_run(run_id)
+                except httpx.HTTPStatusError as e:
+                    if e.response.status_code == 404:
+                        gone_run_ids.append(run_id)
+                    else:
+                        print(f"[WARN] Failed to refresh run {run_id}: {e}")
+                    return None
+                except Exception as e:
+                    print(f"[WARN] Failed to refresh run {run_id}: {e}")
+                    return None
+
+        runs = listed + list(await asyncio.gather(*(fetch(run_id) for run_id in run_ids)))
+        refreshed: list[Pipeline] = []
+        try:
+            for run in runs:
+                if run is None:
+                    continue
+                pipeline = self.upsert_run(db, run)
+                if pipeline is not None:
+                    refreshed.append(pipeline)
+            if gone_run_ids:
+                # Deleted or expired on GitHub; close them out so they are not polled forever
+                gone = db.query(Pipeline).filter(Pipeline.github_run_id.in_(gone_run_ids)).all()
+                for pipeline in gone:
+                    pipeline.status = "completed"
+                    pipeline.conclusion = "cancelled"
+                refreshed.extend(gone)
+                print(f"[Sync] Marked {len(gone)} runs no longer on GitHub as cancelled.")
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[ERROR] Failed to store refreshed runs: {e}")
+            return []
+        return refreshed
@@ -0,0 +1,81 @@
+import asyncio
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import text
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.services.github_service import GitHubService
+from app.services.slack_service import SlackService
+
+
+class HealthProber:
+    """
+    Checks the database, GitHub and Slack on its own schedule and keeps the latest
+    results in memory, so health endpoints never make outbound calls themselves.
+    """
+
+    def __init__(self, interval_seconds: int = settings.HEALTH_PROBE_INTERVAL_SECONDS):
+        self.interval_seconds = interval_seconds
+        self.database = "unknown"
+        self.github = "not_configured" if not settings.GITHUB_TOKEN else "unknown"
+        self.slack = "not_configured" if not settings.SLACK_WEBHOOK_URL else "unknown"
+        self.github_rate_limit: Optional[dict] = None
+        self.checked_at: Optional[datetime] = None
+
+    def _check_database(self):
+        db = SessionLocal()
+        try:
+            db.execute(text("SELECT 1"))
+        finally:
+            db.close()
+
+    async def probe_database(self):
+        try:
+            await asyncio.to_thread(self._check_database)
+            self.database = "healthy"
+        except Exception as e:
+            self.database = f"unhealthy: {str(e)}"
+
+    async def probe_github(self):
+        if not settings.GITHUB_TOKEN:
+            return
+        try:
+            core = await GitHubService().get_rate_limit()
+            self.github_rate_limit = {
+                "limit": core["limit"],
+                "remaining": core["remaining"],
+                "reset": datetime.fromtimestamp(core["reset"], tz=timezone.utc),
+            }
+            self.github = "healthy" if core["remaining"] > 0 else "rate_limited"
+        except Exception as e:
+            self.github = f"unhealthy: {str(e)}"
+
+    async def probe_slack(self):
+        if not settings.SLACK_WEBHOOK_URL:
+            return
+        try:
+            await SlackService().test_connection()
+            self.slack = "healthy"
+        except Exception as e:
+            self.slack = f"unhealthy: {str(e)}"
+
+    async def probe(self):
+        await asyncio.gather(self.probe_database(), self.probe_github(), self.probe_slack())
+        self.checked_at = datetime.now(timezone.utc)
+
+    async def run(self):
+        while True:
+            try:
+                await self.probe()
+            except Exception as e:
+                print(f"ERROR in health prober: {e}")
+            await asyncio.sleep(self.interval_seconds)
+
+    @property
+    def ready(self) -> bool:
+        return self.database == "healthy"
+
+
+health_prober = HealthProber()
@@ -0,0 +1,272 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import exists, func
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.core.config import settings
+from app.models.pipeline import Pipeline
+
+try:
+    import numpy as np
+except ImportError:  # the hot window is optional; routes fall back to SQL without it
+    np = None
+
+
+def _epoch(value: datetime) -> float:
+    """Seconds since the epoch; naive datetimes are UTC, as produced by datetime.utcnow()"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class _Codes:
+    """Dictionary encoding of a string column; code 0 stands for NULL"""
+
+    def __init__(self):
+        self.values: list[Optional[str]] = [None]
+        self.codes: dict[Optional[str], int] = {None: 0}
+
+    def encode(self, value: Optional[str]) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.values)
+            self.codes[value] = code
+            self.values.append(value)
+        return code
+
+    def get(self, value: str) -> int:
+        return self.codes.get(value, -1)
+
+
+class HotWindow:
+    """
+    Keeps the last ANALYTICS_HOT_WINDOW_DAYS of pipelines in NumPy columns so the
+    dashboard aggregations can be answered with masks and bincounts instead of SQL.
+    Loaded once at startup and brought up to date after each sync by pulling the rows
+    whose change_seq moved; ranges older than the window are left to SQL.
+    """
+
+    def __init__(self, days: int = settings.ANALYTICS_HOT_WINDOW_DAYS):
+        self.days = days
+        self.loaded = False
+        self.window_start = 0.0
+        # True while no row older than window_start exists, so all-time questions can be answered too
+        self.complete = False
+        self.last_change_seq = 0
+        self._lock = threading.Lock()
+        self._index: dict[int, int] = {}
+        self._size = 0
+        self.workflows = _Codes()
+        self.statuses = _Codes()
+        self.conclusions = _Codes()
+        self._allocate(1024)
+
+    @property
+    def enabled(self) -> bool:
+        return settings.ANALYTICS_HOT_WINDOW_ENABLED and np is not None
+
+    def _allocate(self, capacity: int):
+        if np is None:
+            return
+        self.capacity = capacity
+        self.ts = np.zeros(capacity, dtype=np.float64)
+        self.workflow = np.zeros(capacity, dtype=np.int32)
+        self.status = np.zeros(capacity, dtype=np.int16)
+        self.conclusion = np.zeros(capacity, dtype=np.int16)
+        self.duration = np.full(capacity, np.nan, dtype=np.float64)
+
+    def _grow(self):
+        size = self._size
+        old = (self.ts, self.workflow, self.status, self.conclusion, self.duration)
+        self._allocate(self.capacity * 2)
+        for new_column, old_column in zip((self.ts, self.workflow, self.status, self.conclusion, self.duration), old):
+            new_column[:size] = old_column[:size]
+
+    def _put(self, pipeline_id: int, created_at: datetime, workflow_name: str, status: str,
+             conclusion: Optional[str], duration: Optional[int]):
+        ts = _epoch(created_at)
+        if ts < self.window_start:
+            self.complete = False
+            return
+        row = self._index.get(pipeline_id)
+        if row is None:
+            if self._size == self.capacity:
+                self._grow()
+            row = self._size
+            self._index[pipeline_id] = row
+            self._size += 1
+        self.ts[row] = ts
+        self.workflow[row] = self.workflows.encode(workflow_name)
+        self.status[row] = self.statuses.encode(status)
+        self.conclusion[row] = self.conclusions.encode(conclusion)
+        self.duration[row] = np.nan if duration is None else duration
+
+    def _evict(self):
+        """Drop rows that have aged out of the window and compact the columns"""
+        self.window_start = (datetime.now(timezone.utc) - timedelta(days=self.days)).timestamp()
+        size = self._size
+        keep = self.ts[:size] >= self.window_start
+        if keep.all():
+            return
+        self.complete = False
+        positions = np.flatnonzero(keep)
+        remap = np.full(size, -1, dtype=np.int64)
+        remap[positions] = np.arange(len(positions))
+        for column in (self.ts, self.workflow, self.status, self.conclusion, self.duration):
+            column[:len(positions)] = column[positions]
+        self._index = {pid: int(remap[row]) for pid, row in self._index.items() if remap[row] >= 0}
+        self._size = len(positions)
+
+    def _select(self, db: Session, condition):
+        return db.query(
+            Pipeline.id, Pipeline.created_at, Pipeline.workflow_name, Pipeline.status,
+            Pipeline.conclusion, Pipeline.duration, Pipeline.change_seq
+        ).filter(condition).all()
+
+    def load(self, session_factory: sessionmaker):
+        if not self.enabled:
+            return
+        db = session_factory()
+        try:
+            cutoff = datetime.now(timezone.utc) - timedelta(days=self.days)
+            # Read before the rows, so nothing changed in between can be skipped by refresh()
+            last_change_seq = db.query(func.max(Pipeline.change_seq)).scalar() or 0
+            rows = self._select(db, Pipeline.created_at >= cutoff)
+            older = db.query(Pipeline.id).filter(Pipeline.created_at < cutoff).first()
+            with self._lock:
+                self._index = {}
+                self._size = 0
+                self._allocate(max(1024, len(rows) * 2))
+                self.window_start = cutoff.timestamp()
+                for row in rows:
+                    self._put(row.id, row.created_at, row.workflow_name, row.status, row.conclusion, row.duration)
+                self.last_change_seq = last_change_seq
+                self.complete = older is None
+                self.loaded = True
+            print(f"[Analytics] Hot window loaded with {len(rows)} pipelines from the last {self.days} days.")
+        finally:
+            db.close()
+
+    def refresh(self, db: Session):
+        """Apply rows inserted or updated since the last refresh, then evict expired rows"""
+        if not self.loaded:
+            return
+        last_change_seq = db.query(func.max(Pipeline.change_seq)).scalar() or 0
+        changed = Pipeline.change_seq > self.last_change_seq
+        window_start = datetime.fromtimestamp(self.window_start, tz=timezone.utc)
+        # Changes to older rows (backfills, renumbering) only matter for `complete`
+        rows = self._select(db, changed & (Pipeline.created_at >= window_start))
+        older_changed = db.query(exists().where(changed, Pipeline.created_at < window_start)).scalar()
+        with self._lock:
+            for row in rows:
+                self._put(row.id, row.created_at, row.workflow_name, row.status, row.conclusion, row.duration)
+                last_change_seq = max(last_change_seq, row.change_seq)
+            self.last_change_seq = max(self.last_change_seq, last_change_seq)
+            if older_changed:
+                self.complete = False
+            self._evict()
+
+    def covers(self, start_time: Optional[datetime]) -> bool:
+        """Whether a range starting at start_time (None for all time) can be answered from memory"""
+        if not (self.enabled and self.loaded):
+            return False
+        if start_time is None:
+            return self.complete
+        return _epoch(start_time) >= self.window_start
+
+    def _masks(self, start_time: Optional[datetime]):
+        size = self._size
+        ts = self.ts[:size]
+        in_range = ts >= _epoch(start_time) if start_time is not None else np.ones(size, dtype=bool)
+        completed = self.status[:size] == self.statuses.get("completed")
+        conclusion = self.conclusion[:size]
+        success = completed & (conclusion == self.conclusions.get("success"))
+        failure = completed & (conclusion == self.conclusions.get("failure"))
+        return in_range, completed, success, failure
+
+    def summarize(self, start_time: datetime) -> dict:
+        """Totals, build-time stats and per-workflow counts for get_metrics"""
+        with self._lock:
+            size = self._size
+            in_range, completed, success, failure = self._masks(start_time)
+            completed &= in_range
+            duration = self.duration[:size]
+            has_duration = ~np.isnan(duration)
+            build_times = duration[completed & has_duration]
+
+            workflow = self.workflow[:size]
+            n = len(self.workflows.values)
+            executions = np.bincount(workflow[in_range], minlength=n)
+            completed_counts = np.bincount(workflow[completed], minlength=n)
+            success_counts = np.bincount(workflow[completed & success], minlength=n)
+            failure_counts = np.bincount(workflow[completed & failure], minlength=n)
+            timed = completed & has_duration
+            total_time = np.bincount(workflow[timed], weights=duration[timed], minlength=n)
+
+            workflow_data = {
+                self.workflows.values[code]: {
+                    'executions': int(executions[code]),
+                    'success_count': int(success_counts[code]),
+                    'failure_count': int(failure_counts[code]),
+                    'total_time': float(total_time[code]),
+                    'completed_count': int(completed_counts[code]),
+                }
+                for code in np.flatnonzero(executions)
+            }
+            return {
+                'total_executions': int(in_range.sum()),
+                'success_count': int((success & in_range).sum()),
+                'failure_count': int((failure & in_range).sum()),
+                'average_build_time': float(build_times.mean()) if len(build_times) else None,
+                'min_build_time': int(build_times.min()) if len(build_times) else None,
+                'max_build_time': int(build_times.max()) if len(build_times) else None,
+                'workflow_data': workflow_data,
+            }
+
+    def trend(self, metric: str, start_time: datetime, interval_hours: int, buckets: int) -> list[float]:
+        """One value per interval bucket starting at start_time, as computed by get_metrics_trends"""
+        with self._lock:
+            size = self._size
+            in_range, completed, success, failure = self._masks(start_time)
+            bucket = ((self.ts[:size] - _epoch(start_time)) // (interval_hours * 3600)).astype(np.int64)
+            in_range &= bucket < buckets
+            bucket = np.where(in_range, bucket, 0)
+
+            def count(mask):
+                return np.bincount(bucket[mask & in_range], minlength=buckets)[:buckets]
+
+            if metric == "success_rate":
+                done = count(completed)
+                ok = count(success)
+                values = np.divide(ok * 100.0, done, out=np.zeros(buckets), where=done > 0)
+            elif metric == "build_time":
+                duration = self.duration[:size]
+                timed = completed & in_range & ~np.isnan(duration) & (duration != 0)
+                totals = np.bincount(bucket[timed], weights=duration[timed], minlength=buckets)[:buckets]
+                counts = count(timed)
+                values = np.divide(totals, counts, out=np.zeros(buckets), where=counts > 0)
+            elif metric == "failure_count":
+                values = count(failure)
+            else:
+                raise ValueError(f"Unknown metric {metric}")
+            return values.tolist()
+
+    def stats(self) -> dict:
+        """All-time counts for get_pipeline_stats; only valid while covers(None)"""
+        with self._lock:
+            size = self._size
+            in_range, completed, success, failure = self._masks(None)
+            duration = self.duration[:size]
+            timed = duration[completed & ~np.isnan(duration)]
+            return {
+                'total': size,
+                'success_count': int(success.sum()),
+                'failure_count': int(failure.sum()),
+                'running_count': int((self.status[:size] == self.statuses.get("in_progress")).sum()),
+                'average_build_time': float(timed.mean()) if len(timed) else 0,
+            }
+
+
+hot_window = HotWindow()
@@ -0,0 +1,172 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from sqlalchemy import text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.pipeline import Pipeline, PipelineJob, PipelineJobFetch
+from app.services.github_service import GitHubService
+
+STEP_ROLLUP_SQL = text("""
+SELECT
+    p.workflow_name,
+    j.name AS job_name,
+    s->>'name' AS step_name,
+    COUNT(*) AS executions,
+    COUNT(*) FILTER (WHERE s->>'conclusion' = 'failure') AS failure_count,
+    AVG((s->>'duration')::int) AS average_duration,
+    MAX((s->>'duration')::int) AS max_duration
+FROM pipeline_jobs j
+JOIN pipelines p ON p.id = j.pipeline_id
+CROSS JOIN LATERAL jsonb_array_elements(j.steps) AS s
+WHERE p.created_at >= :start_time
+  AND (CAST(:workflow AS TEXT) IS NULL OR p.workflow_name = :workflow)
+GROUP BY p.workflow_name, j.name, s->>'name'
+ORDER BY average_duration DESC NULLS LAST
+""")
+
+
+def _parse_timestamp(value: Optional[str]) -> Optional[datetime]:
+    return datetime.fromisoformat(value.replace("Z", "+00:00")) if value else None
+
+
+def _duration(started_at: Optional[datetime], completed_at: Optional[datetime]) -> Optional[int]:
+    return int((completed_at - started_at).total_seconds()) if started_at and completed_at else None
+
+
+class JobService:
+    """
+    Loads job- and step-level timings for a run from GitHub only when they are needed.
+    Jobs of a completed run are kept forever; jobs of a run still in flight are
+    refetched at most every JOBS_REFRESH_SECONDS.
+    """
+
+    def __init__(self, github_service: Optional[GitHubService] = None):
+        self.github_service = github_service or GitHubService()
+
+    def is_fresh(self, pipeline: Pipeline, fetched_at: Optional[datetime]) -> bool:
+        if fetched_at is None:
+            return False
+        # A fetch made after the run completed saw its final job list, even an empty one
+        if pipeline.status == "completed" and (pipeline.completed_at is None or fetched_at >= pipeline.completed_at):
+            return True
+        return datetime.now(timezone.utc) - fetched_at < timedelta(seconds=settings.JOBS_REFRESH_SECONDS)
+
+    def mark_fetched(self, db: Session, pipeline_id: int):
+        fetched_at = datetime.now(timezone.utc)
+        db.execute(
+            pg_insert(PipelineJobFetch)
+            .values(pipeline_id=pipeline_id, fetched_at=fetched_at)
+            .on_conflict_do_update(index_elements=[PipelineJobFetch.pipeline_id], set_={"fetched_at": fetched_at})
+        )
+
+    def parse_job(self, pipeline: Pipeline, job_data: dict) -> PipelineJob:
+        started_at = _parse_timestamp(job_data.get("started_at"))
+        completed_at = _parse_timestamp(job_data.get("completed_at"))
+        steps = []
+        for step in job_data.get("steps") or []:
+            steps.append({
+                "number": step.get("number"),
+                "name": step.get("name"),
+                "status": step.get("status"),
+                "conclusion": step.get("conclusion"),
+                "duration": _duration(_parse_timestamp(step.get("started_at")), _parse_timestamp(step.get("completed_at"))),
+            })
+        return PipelineJob(
+            pipeline_id=pipeline.id,
+            github_job_id=job_data["id"],
+            name=job_data["name"],
+            status=job_data["status"],
+            conclusion=job_data.get("conclusion"),
+            started_at=started_at,
+            completed_at=completed_at,
+            duration=_duration(started_at, completed_at),
+            steps=steps,
+            fetched_at=datetime.now(timezone.utc),
+        )
+
+    async def get_jobs(self, pipeline: Pipeline, db: Session) -> list[PipelineJob]:
+        """Return the run's jobs, fetching them from GitHub if the cached copy is missing or stale"""
+        pipeline_id = pipeline.id
+        cached = db.query(PipelineJob).filter(PipelineJob.pipeline_id == pipeline_id).order_by(PipelineJob.started_at).all()
+        fetch = db.get(PipelineJobFetch, pipeline_id)
+        if self.is_fresh(pipeline, fetch.fetched_at if fetch else None):
+            return cached
+
+        try:
+            jobs_data = await self.github_service.get_run_jobs(pipeline.github_run_id)
+        except Exception as e:
+            print(f"[WARN] Failed to fetch jobs for pipeline {pipeline_id}: {e}")
+            return cached
+
+        jobs = [self.parse_job(pipeline, job_data) for job_data in jobs_data]
+        try:
+            db.query(PipelineJob).filter(PipelineJob.pipeline_id == pipeline_id).delete()
+            db.add_all(jobs)
+            self.mark_fetched(db, pipeline_id)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[WARN] Failed to store jobs for pipeline {pipeline_id}: {e}")
+            return cached
+        return sorted(jobs, key=lambda job: job.started_at or datetime.max.replace(tzinfo=timezone.utc))
+
+    async def prefetch_failures(self, pipelines: list[Pipeline], db: Session):
+        """Load jobs for newly failed runs so their breakdown is ready before anyone opens them"""
+        failed = [p for p in pipelines if p.status == "completed" and p.conclusion == "failure"]
+        if not failed:
+            return
+
+        fetched_at = dict(db.query(PipelineJobFetch.pipeline_id, PipelineJobFetch.fetched_at).filter(
+            PipelineJobFetch.pipeline_id.in_([p.id for p in failed])
+        ).all())
+        pending = [p for p in failed if not self.is_fresh(p, fetched_at.get(p.id))]
+        if not pending:
+            return
+
+        slots = asyncio.Semaphore(settings.JOBS_PREFETCH_CONCURRENCY)
+
+        async def fetch(pipeline: Pipeline):
+            async with slots:
+                try:
+                    return pipeline, await self.github_service.get_run_jobs(pipeline.github_run_id)
+                except Exception as e:
+                    print(f"[WARN] Failed to prefetch jobs for pipeline {pipeline.id}: {e}")
+                    return pipeline, None
+
+        # Fetch concurrently, but keep all session work on this task
+        results = await asyncio.gather(*(fetch(p) for p in pending))
+        fetched = 0
+        try:
+            for pipeline, jobs_data in results:
+                if jobs_data is None:
+                    continue
+                db.query(PipelineJob).filter(PipelineJob.pipeline_id == pipeline.id).delete()
+                db.add_all([self.parse_job(pipeline, job_data) for job_data in jobs_data])
+                self.mark_fetched(db, pipeline.id)
+                fetched += 1
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"[WARN] Failed to store prefetched jobs: {e}")
+            return
+        print(f"[Jobs] Prefetched jobs for {fetched} failed runs.")
+
+    def step_rollup(self, db: Session, start_time: datetime, workflow: Optional[str] = None) -> list[dict]:
+        """Per-step duration aggregates over the jobs cached so far"""
+        rows = db.execute(STEP_ROLLUP_SQL, {"start_time": start_time, "workflow": workflow}).all()
+        return [
+            {
+                "workflow_name": row.workflow_name,
+                "job_name": row.job_name,
+                "step_name": row.step_name,
+                "executions": row.executions,
+                "failure_count": row.failure_count,
+                "average_duration": round(float(row.average_duration), 2) if row.average_duration is not None else None,
+                "max_duration": row.max_duration,
+            }
+            for row in rows
+        ]
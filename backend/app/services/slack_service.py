@@ -57,6 +57,16 @@ class SlackService:
             print(f"[Slack] Processed {len(alerts_to_add)} new notifications.")
 
 
+    async def test_connection(self):
+        """
+        Check the webhook without posting a message: Slack rejects an empty payload with
+        400 when the webhook is valid, and with 403/404/410 when it is revoked or unknown.
+        """
+        async with httpx.AsyncClient() as client:
+            response = await client.post(self.webhook_url, json={}, timeout=10.0)
+        if response.status_code not in (200, 400):
+            raise Exception(f"webhook returned {response.status_code} {response.text}")
+
     async def send_pipeline_failure_alert(self, pipeline: Pipeline) -> bool:
         return await self._send_pipeline_message(pipeline, success=False)
 
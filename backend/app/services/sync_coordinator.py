@@ -0,0 +1,101 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.config import settings
+from app.core.database import SessionLocal, replica_router
+from app.services.github_service import GitHubService
+from app.services.hot_window import hot_window
+from app.services.job_service import JobService
+from app.services.slack_service import SlackService
+from app.services.sync_scheduler import SyncScheduler
+
+# Finished jobs kept around for GET /api/pipelines/sync/{job_id}
+MAX_TRACKED_JOBS = 100
+
+
+class SyncJob:
+    def __init__(self, source: str):
+        self.id = uuid.uuid4().hex
+        self.source = source
+        self.status = "running"
+        self.started_at = datetime.now(timezone.utc)
+        self.finished_at: Optional[datetime] = None
+        self.new_executions: Optional[int] = None
+        self.in_flight = False
+        self.error: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+
+
+class SyncCoordinator:
+    """
+    Runs at most one GitHub sync at a time. Manual and background triggers that arrive
+    while a sync is running join it instead of starting their own, and manual triggers
+    within SYNC_MANUAL_MIN_INTERVAL_SECONDS of the last sync, from either source and
+    whatever its outcome, get that sync back, so the number of upstream calls does not
+    grow with the number of clients. Each sync sends its notifications once, from the
+    same round.
+    """
+
+    def __init__(self, github_service: Optional[GitHubService] = None):
+        self.github_service = github_service or GitHubService()
+        self.scheduler = SyncScheduler(self.github_service)
+        self.current: Optional[SyncJob] = None
+        self.last: Optional[SyncJob] = None
+        self.jobs: OrderedDict[str, SyncJob] = OrderedDict()
+
+    def get_job(self, job_id: str) -> Optional[SyncJob]:
+        return self.jobs.get(job_id)
+
+    def trigger(self, source: str = "manual") -> SyncJob:
+        """Return the running sync, the last sync for a manual trigger right after it, or a new one"""
+        if self.current is not None:
+            return self.current
+        if source == "manual" and self.last is not None:
+            elapsed = (datetime.now(timezone.utc) - self.last.started_at).total_seconds()
+            if elapsed < settings.SYNC_MANUAL_MIN_INTERVAL_SECONDS:
+                return self.last
+
+        job = SyncJob(source)
+        self.current = job
+        self.last = job
+        self.jobs[job.id] = job
+        while len(self.jobs) > MAX_TRACKED_JOBS:
+            self.jobs.popitem(last=False)
+        job.task = asyncio.create_task(self._run(job))
+        return job
+
+    async def wait(self, job: SyncJob) -> SyncJob:
+        # Shielded so a caller that goes away does not cancel the sync for everyone else
+        await asyncio.shield(job.task)
+        return job
+
+    async def _run(self, job: SyncJob):
+        db = SessionLocal()
+        try:
+            synced_pipelines = await self.scheduler.sync(db)
+            if synced_pipelines:
+                replica_router.record_write()
+                hot_window.refresh(db)
+                print(f"Sync complete. Found {len(synced_pipelines)} new/updated runs. Checking for notifications.")
+                await SlackService().send_notifications_for_completed_runs(synced_pipelines, db)
+                await JobService(self.github_service).prefetch_failures(synced_pipelines, db)
+            else:
+                print("Sync complete. No new updates found.")
+            job.new_executions = len(synced_pipelines)
+            job.in_flight = self.scheduler.has_in_flight(db)
+            job.status = "completed"
+        except Exception as e:
+            print(f"[ERROR] Sync {job.id} ({job.source}) failed: {e}")
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+        finally:
+            db.close()
+            job.finished_at = datetime.now(timezone.utc)
+            self.current = None
+
+
+sync_coordinator = SyncCoordinator()
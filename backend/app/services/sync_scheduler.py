@@ -0,0 +1,52 @@
+import time
+from typing import Optional
+
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.pipeline import Pipeline
+from app.services.github_service import GitHubService, in_flight_conditions
+
+
+class SyncScheduler:
+    """
+    Decides what the background sync fetches and how long it sleeps between rounds.
+    While runs are queued or in progress it polls every SYNC_ACTIVE_INTERVAL_SECONDS and
+    refreshes just those runs; runs unfinished for more than SYNC_IN_FLIGHT_MAX_AGE_HOURS
+    are re-checked only every SYNC_OLD_IN_FLIGHT_INTERVAL_SECONDS and do not keep the
+    fast interval. Once the repository goes quiet the interval starts at
+    SYNC_INTERVAL_SECONDS and grows by SYNC_BACKOFF_FACTOR up to SYNC_MAX_INTERVAL_SECONDS.
+    """
+
+    def __init__(self, github_service: Optional[GitHubService] = None):
+        self.github_service = github_service or GitHubService()
+        self.idle_interval = settings.SYNC_INTERVAL_SECONDS
+        self.full_sync_done = False
+        self.old_in_flight_checked_at: Optional[float] = None
+
+    async def sync(self, db: Session) -> list[Pipeline]:
+        # One full pagination at startup to catch up; afterwards only new pages and in-flight runs
+        synced = await self.github_service.sync_workflow_runs(db, full=not self.full_sync_done)
+        # A catch-up cut short (outage, rate limit) is retried in full next round
+        self.full_sync_done = self.full_sync_done or self.github_service.last_sync_complete
+        include_old = (
+            self.old_in_flight_checked_at is None
+            or time.monotonic() - self.old_in_flight_checked_at >= settings.SYNC_OLD_IN_FLIGHT_INTERVAL_SECONDS
+        )
+        synced += await self.github_service.refresh_in_flight_runs(
+            db, skip_run_ids=self.github_service.seen_run_ids, include_old=include_old
+        )
+        if include_old:
+            self.old_in_flight_checked_at = time.monotonic()
+        return synced
+
+    def has_in_flight(self, db: Session) -> bool:
+        return db.query(Pipeline.id).filter(*in_flight_conditions()).first() is not None
+
+    def next_interval(self, changed: bool, in_flight: bool) -> float:
+        if in_flight or changed:
+            self.idle_interval = settings.SYNC_INTERVAL_SECONDS
+            return settings.SYNC_ACTIVE_INTERVAL_SECONDS if in_flight else settings.SYNC_INTERVAL_SECONDS
+        interval = self.idle_interval
+        self.idle_interval = min(interval * settings.SYNC_BACKOFF_FACTOR, settings.SYNC_MAX_INTERVAL_SECONDS)
+        return interval
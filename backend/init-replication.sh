@@ -0,0 +1,3 @@
+#!/bin/sh
+# Allow streaming replication connections so a local read replica can pg_basebackup from this server
+echo "host replication all all scram-sha-256" >> "$PGDATA/pg_hba.conf"
@@ -1,5 +1,8 @@
 -- Initialize CI/CD Dashboard Database
 
+-- Extensions
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+
 -- Create tables
 CREATE TABLE IF NOT EXISTS pipelines (
     id BIGSERIAL PRIMARY KEY,
@@ -18,9 +21,30 @@ CREATE TABLE IF NOT EXISTS pipelines (
     actor VARCHAR(255),
     html_url TEXT,
     logs_url TEXT,
+    change_seq BIGINT,
+    commit_message_tsv TSVECTOR GENERATED ALWAYS AS (to_tsvector('english', coalesce(commit_message, ''))) STORED,
     created_date DATE GENERATED ALWAYS AS (created_at::date) STORED
 );
 
+CREATE TABLE IF NOT EXISTS pipeline_jobs (
+    id BIGSERIAL PRIMARY KEY,
+    pipeline_id BIGINT NOT NULL REFERENCES pipelines(id),
+    github_job_id BIGINT UNIQUE NOT NULL,
+    name VARCHAR(255) NOT NULL,
+    status VARCHAR(50) NOT NULL,
+    conclusion VARCHAR(50),
+    started_at TIMESTAMP WITH TIME ZONE,
+    completed_at TIMESTAMP WITH TIME ZONE,
+    duration INTEGER,
+    steps JSONB NOT NULL DEFAULT '[]',
+    fetched_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT NOW()
+);
+
+CREATE TABLE IF NOT EXISTS pipeline_job_fetches (
+    pipeline_id BIGINT PRIMARY KEY REFERENCES pipelines(id),
+    fetched_at TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
 CREATE TABLE IF NOT EXISTS workflows (
     id SERIAL PRIMARY KEY,
     name VARCHAR(255) UNIQUE NOT NULL,
@@ -48,15 +72,48 @@ CREATE TABLE IF NOT EXISTS metrics_cache (
     expires_at TIMESTAMP WITH TIME ZONE NOT NULL
 );
 
+CREATE TABLE IF NOT EXISTS backfill_checkpoints (
+    id SERIAL PRIMARY KEY,
+    repository VARCHAR(255) NOT NULL,
+    range_start TIMESTAMP WITH TIME ZONE NOT NULL,
+    range_end TIMESTAMP WITH TIME ZONE NOT NULL,
+    runs_loaded INTEGER NOT NULL DEFAULT 0,
+    completed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    CONSTRAINT uq_backfill_checkpoints_range UNIQUE (repository, range_start, range_end)
+);
+
 -- Create indexes for performance
 CREATE INDEX IF NOT EXISTS idx_pipelines_status ON pipelines(status);
 CREATE INDEX IF NOT EXISTS idx_pipelines_created_at ON pipelines(created_at);
 CREATE INDEX IF NOT EXISTS idx_pipelines_workflow ON pipelines(workflow_name);
 CREATE INDEX IF NOT EXISTS idx_pipelines_created_date ON pipelines(created_date);
+CREATE INDEX IF NOT EXISTS idx_pipelines_change_seq ON pipelines(change_seq);
+CREATE INDEX IF NOT EXISTS idx_pipelines_commit_message_tsv ON pipelines USING gin (commit_message_tsv);
+CREATE INDEX IF NOT EXISTS idx_pipelines_branch_trgm ON pipelines USING gin (branch gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_pipelines_actor_trgm ON pipelines USING gin (actor gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS idx_pipelines_created_at_compact ON pipelines(created_at DESC)
+    INCLUDE (id, workflow_name, status, conclusion, duration);
+CREATE INDEX IF NOT EXISTS idx_pipeline_jobs_pipeline_id ON pipeline_jobs(pipeline_id);
 CREATE INDEX IF NOT EXISTS idx_alerts_pipeline_id ON alerts(pipeline_id);
 CREATE INDEX IF NOT EXISTS idx_alerts_sent_at ON alerts(sent_at);
 CREATE INDEX IF NOT EXISTS idx_metrics_cache_expires ON metrics_cache(expires_at);
 
+-- Monotonic change sequence for /api/pipelines/changes; writers serialize on an
+-- advisory lock until commit so sequence order matches commit order
+CREATE SEQUENCE IF NOT EXISTS pipelines_change_seq;
+
+CREATE OR REPLACE FUNCTION pipelines_bump_change_seq() RETURNS trigger AS $$
+BEGIN
+    PERFORM pg_advisory_xact_lock(7202902);
+    NEW.change_seq := nextval('pipelines_change_seq');
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER pipelines_change_seq_trigger
+BEFORE INSERT OR UPDATE ON pipelines
+FOR EACH ROW EXECUTE FUNCTION pipelines_bump_change_seq();
+
 -- Create views for analytics
 CREATE OR REPLACE VIEW daily_metrics AS
 SELECT
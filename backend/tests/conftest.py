@@ -0,0 +1,75 @@
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import BigInteger, create_engine, event
+from sqlalchemy.dialects.postgresql import JSONB, TSVECTOR
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.core.database import Base
+from app.models.pipeline import Pipeline
+
+
+# The models target PostgreSQL; render its types so the same tables can be created in SQLite
+@compiles(JSONB, "sqlite")
+def _compile_jsonb(type_, compiler, **kw):
+    return "JSON"
+
+
+@compiles(TSVECTOR, "sqlite")
+def _compile_tsvector(type_, compiler, **kw):
+    return "TEXT"
+
+
+@compiles(BigInteger, "sqlite")
+def _compile_bigint(type_, compiler, **kw):
+    # SQLite only auto-increments INTEGER PRIMARY KEY columns
+    return "INTEGER"
+
+
+@pytest.fixture
+def session_factory():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+
+    @event.listens_for(engine, "connect")
+    def _register_functions(connection, record):
+        connection.create_function("to_tsvector", 2, lambda config, document: document, deterministic=True)
+
+    Base.metadata.create_all(bind=engine)
+    yield sessionmaker(bind=engine, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def now() -> datetime:
+    # Whole seconds, naive UTC like datetime.utcnow() in the routes, so SQL and NumPy bucket alike
+    return datetime.utcnow().replace(microsecond=0)
+
+
+@pytest.fixture
+def pipelines(session_factory, now) -> list[Pipeline]:
+    """A few days of mixed runs across three workflows"""
+    statuses = ["completed", "completed", "completed", "in_progress", "queued"]
+    conclusions = ["success", "failure", "success", "cancelled"]
+    rows = []
+    for i in range(1, 121):
+        status = statuses[i % len(statuses)]
+        rows.append(Pipeline(
+            id=i,
+            github_run_id=1000 + i,
+            workflow_name=f"workflow-{i % 3}",
+            status=status,
+            conclusion=conclusions[(i // len(statuses)) % len(conclusions)] if status == "completed" else None,
+            created_at=now - timedelta(hours=i * 0.5, seconds=i * 13),
+            updated_at=now,
+            duration=None if i % 11 == 0 else (0 if i % 17 == 0 else 30 + i * 3),
+            change_seq=i,
+            html_url="https://example.invalid",
+            logs_url="https://example.invalid",
+        ))
+    db = session_factory()
+    db.add_all(rows)
+    db.commit()
+    db.close()
+    return rows
@@ -0,0 +1,47 @@
+import math
+
+from app.services.downsampling import lttb, min_max_envelope
+
+
+def _series(n: int) -> list[tuple[float, float]]:
+    return [(float(i), math.sin(i / 10) * 100) for i in range(n)]
+
+
+def test_lttb_returns_short_series_unchanged():
+    points = _series(10)
+    assert lttb(points, 20) == points
+    assert lttb(points, 2) == points
+
+
+def test_lttb_keeps_endpoints_and_order():
+    points = _series(1000)
+    sampled = lttb(points, 50)
+
+    assert len(sampled) == 50
+    assert sampled[0] == points[0]
+    assert sampled[-1] == points[-1]
+    assert [x for x, _ in sampled] == sorted({x for x, _ in sampled})
+    assert set(sampled) <= set(points)
+
+
+def test_lttb_keeps_a_spike():
+    points = [(float(i), 0.0) for i in range(1000)]
+    points[437] = (437.0, 500.0)
+    assert (437.0, 500.0) in lttb(points, 30)
+
+
+def test_min_max_envelope_keeps_extremes_of_each_bucket():
+    points = [(float(i), 0.0) for i in range(1000)]
+    points[123] = (123.0, 9.0)
+    points[877] = (877.0, -4.0)
+    sampled = min_max_envelope(points, 40)
+
+    assert len(sampled) <= 40
+    assert (123.0, 9.0) in sampled
+    assert (877.0, -4.0) in sampled
+    assert [x for x, _ in sampled] == sorted(x for x, _ in sampled)
+
+
+def test_min_max_envelope_returns_short_series_unchanged():
+    points = _series(10)
+    assert min_max_envelope(points, 10) == points
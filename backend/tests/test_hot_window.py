@@ -0,0 +1,78 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from app.api.routes.metrics import _bucketed_trend, _summarize_pipelines
+from app.api.routes.pipelines import get_pipeline_stats
+from app.core.config import settings
+from app.models.pipeline import Pipeline
+from app.services.hot_window import HotWindow
+
+
+@pytest.fixture
+def hot_window(monkeypatch, session_factory, pipelines):
+    """A hot window loaded from the same rows the SQL paths read"""
+    monkeypatch.setattr(settings, "ANALYTICS_HOT_WINDOW_ENABLED", True)
+    window = HotWindow(days=7)
+    window.load(session_factory)
+    return window
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+@pytest.mark.parametrize("hours", [1, 24, 72])
+def test_summarize_matches_sql(hot_window, db, now, hours):
+    start_time = now - timedelta(hours=hours)
+    expected = _summarize_pipelines(db.query(Pipeline).filter(Pipeline.created_at >= start_time).all())
+    summary = hot_window.summarize(start_time)
+
+    for key in ("total_executions", "success_count", "failure_count", "min_build_time", "max_build_time"):
+        assert summary[key] == expected[key], key
+    assert summary["average_build_time"] == pytest.approx(expected["average_build_time"])
+    assert summary["workflow_data"].keys() == expected["workflow_data"].keys()
+    for workflow, data in expected["workflow_data"].items():
+        assert summary["workflow_data"][workflow] == pytest.approx(data), workflow
+
+
+@pytest.mark.parametrize("metric", ["success_rate", "build_time", "failure_count"])
+@pytest.mark.parametrize("hours,interval_hours", [(24, 1), (72, 6)])
+def test_trend_matches_sql(hot_window, db, now, metric, hours, interval_hours):
+    start_time = now - timedelta(hours=hours)
+    buckets = hours // interval_hours
+    expected = _bucketed_trend(db, metric, start_time, interval_hours, buckets)
+    assert hot_window.trend(metric, start_time, interval_hours, buckets) == pytest.approx(expected)
+
+
+def test_stats_matches_sql(hot_window, db):
+    assert hot_window.covers(None)
+    stats = hot_window.stats()
+    # The module-level hot window is not loaded here, so the route answers from SQL
+    expected = asyncio.run(get_pipeline_stats(db=db))
+
+    assert stats["total"] == expected["total_pipelines"]
+    assert stats["success_count"] == expected["success_count"]
+    assert stats["failure_count"] == expected["failure_count"]
+    assert stats["running_count"] == expected["running_count"]
+    assert round(stats["average_build_time"], 2) == expected["average_build_time"]
+
+
+def test_refresh_applies_changed_rows(hot_window, session_factory, now):
+    db = session_factory()
+    pipeline = db.get(Pipeline, 1)
+    pipeline.status, pipeline.conclusion, pipeline.change_seq = "completed", "failure", 500
+    db.commit()
+
+    before = hot_window.summarize(now - timedelta(hours=1))["failure_count"]
+    hot_window.refresh(db)
+    expected = _summarize_pipelines(db.query(Pipeline).filter(Pipeline.created_at >= now - timedelta(hours=1)).all())
+    db.close()
+
+    assert hot_window.last_change_seq == 500
+    assert hot_window.summarize(now - timedelta(hours=1))["failure_count"] == expected["failure_count"]
+    assert expected["failure_count"] != before
@@ -0,0 +1,84 @@
+import asyncio
+
+import pytest
+
+from app.core.config import settings
+from app.services import sync_coordinator as sync_coordinator_module
+from app.services.sync_coordinator import SyncCoordinator
+
+
+class FakeScheduler:
+    """Stands in for SyncScheduler; counts upstream syncs and can be told to fail"""
+
+    def __init__(self):
+        self.calls = 0
+        self.error = None
+
+    async def sync(self, db):
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        if self.error:
+            raise self.error
+        return []
+
+    def has_in_flight(self, db):
+        return False
+
+
+@pytest.fixture
+def coordinator(monkeypatch, session_factory):
+    monkeypatch.setattr(sync_coordinator_module, "SessionLocal", session_factory)
+    coordinator = SyncCoordinator()
+    coordinator.scheduler = FakeScheduler()
+    return coordinator
+
+
+def test_triggers_join_the_running_sync(coordinator):
+    async def scenario():
+        jobs = [coordinator.trigger("manual"), coordinator.trigger("background"), coordinator.trigger("manual")]
+        await asyncio.gather(*(coordinator.wait(job) for job in jobs))
+        return jobs
+
+    jobs = asyncio.run(scenario())
+    assert len({job.id for job in jobs}) == 1
+    assert jobs[0].status == "completed"
+    assert coordinator.scheduler.calls == 1
+
+
+def test_manual_trigger_reuses_a_recent_failed_sync(coordinator):
+    coordinator.scheduler.error = Exception("rate limited")
+
+    async def scenario():
+        first = await coordinator.wait(coordinator.trigger("background"))
+        second = await coordinator.wait(coordinator.trigger("manual"))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second is first
+    assert first.status == "failed"
+    assert first.error == "rate limited"
+    assert coordinator.scheduler.calls == 1
+
+
+def test_manual_trigger_after_the_interval_starts_a_new_sync(coordinator, monkeypatch):
+    monkeypatch.setattr(settings, "SYNC_MANUAL_MIN_INTERVAL_SECONDS", 0)
+
+    async def scenario():
+        first = await coordinator.wait(coordinator.trigger("manual"))
+        second = await coordinator.wait(coordinator.trigger("manual"))
+        return first, second
+
+    first, second = asyncio.run(scenario())
+    assert second is not first
+    assert coordinator.scheduler.calls == 2
+    assert coordinator.get_job(first.id) is first
+
+
+def test_background_trigger_ignores_the_manual_interval(coordinator):
+    async def scenario():
+        await coordinator.wait(coordinator.trigger("manual"))
+        return await coordinator.wait(coordinator.trigger("background"))
+
+    job = asyncio.run(scenario())
+    assert job.source == "background"
+    assert coordinator.scheduler.calls == 2